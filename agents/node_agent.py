@@ -64,7 +64,7 @@ def _get_tools() -> List[Tuple[str, List[Callable[..., Any]]]]:
   """
   return [
       (
-          system_instructions.SYSTEM_FUNCTIONS_INSTRUCTIONS,
+          system_instructions.get_system_functions_instructions(),
           [
               objective_failed.objective_failed,
               objective_fulfilled.objective_fulfilled,
@@ -1,13 +1,32 @@
 """Client for interacting with Vertex AI using the genai library."""
 
+import functools
+
 from absl import logging
 from google import genai
+from google.genai import types
+import httpx
 from opal_adk import flags
 from opal_adk.error_handling import opal_adk_error
 from google.rpc import code_pb2
 
+# Connection pool for the shared clients. Idle connections are kept open so
+# successive model calls skip the TCP and TLS handshakes.
+_POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=300,
+)
+_POOLED_HTTP_OPTIONS = types.HttpOptions(
+    client_args={"limits": _POOL_LIMITS},
+    async_client_args={"limits": _POOL_LIMITS},
+)
+
 
-def create_vertex_ai_client(use_vertex: bool = False) -> genai.Client:
+def create_vertex_ai_client(
+    use_vertex: bool = False,
+    http_options: types.HttpOptions | None = None,
+) -> genai.Client:
   """Creates a Vertex AI client using the genai library.
 
   The client is initialized with project and location from opal_adk flags.
@@ -18,6 +37,8 @@ def create_vertex_ai_client(use_vertex: bool = False) -> genai.Client:
       to be provided in environmental variables. If Vertex AI API is being used
       a Google Cloud project and location will need to be provided in
       environmental variables.
+    http_options: Optional HTTP options, such as timeouts and connection pool
+      limits, for the client's transport.
 
   Returns:
     A genai.Client instance configured for Vertex AI.
@@ -30,6 +51,7 @@ def create_vertex_ai_client(use_vertex: bool = False) -> genai.Client:
         vertexai=use_vertex,
         project=flags.get_project_id(),
         location=flags.get_location(),
+        http_options=http_options,
     )
     logging.info("vertex_ai_client: Successfully created Vertex AI client.")
     return vertex_client
@@ -43,3 +65,26 @@ def create_vertex_ai_client(use_vertex: bool = False) -> genai.Client:
         status_code=code_pb2.INTERNAL,
         details="Set GOOGLE_CLOUD_PROJECT/LOCATION",
     ) from e
+
+
+@functools.lru_cache(maxsize=None)
+def get_vertex_ai_client(use_vertex: bool = False) -> genai.Client:
+  """Returns a process-wide client, creating it on first use.
+
+  Reusing one client per API avoids repeating credential discovery and HTTP
+  session setup on every model call, and its pooled transport keeps
+  connections alive between calls.
+
+  Args:
+    use_vertex: If True the client will work with the Cloud Vertex API. If False
+      it will use the Gemini API.
+
+  Returns:
+    The shared genai.Client instance for the requested API.
+
+  Raises:
+    opal_adk_error.OpalAdkError: If the genai.Client cannot be initialized.
+  """
+  return create_vertex_ai_client(
+      use_vertex=use_vertex, http_options=_POOLED_HTTP_OPTIONS
+  )
@@ -5,6 +5,7 @@ from unittest import mock
 
 from absl.testing import absltest
 from google import genai
+from google.genai import types
 from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
 
@@ -22,6 +23,27 @@ class VertexAiClientTest(unittest.TestCase):
     client = vertex_ai_client.create_vertex_ai_client()
     self.assertEqual(client, self.mock_client.return_value)
 
+  def test_create_vertex_ai_client_passes_http_options(self):
+    http_options = types.HttpOptions(timeout=1000)
+    vertex_ai_client.create_vertex_ai_client(http_options=http_options)
+    _, kwargs = self.mock_client.call_args
+    self.assertIs(kwargs['http_options'], http_options)
+
+  def test_get_vertex_ai_client_reuses_client(self):
+    vertex_ai_client.get_vertex_ai_client.cache_clear()
+    self.addCleanup(vertex_ai_client.get_vertex_ai_client.cache_clear)
+
+    first = vertex_ai_client.get_vertex_ai_client(use_vertex=False)
+    second = vertex_ai_client.get_vertex_ai_client(use_vertex=False)
+    vertex_ai_client.get_vertex_ai_client(use_vertex=True)
+
+    self.assertIs(first, second)
+    self.assertEqual(self.mock_client.call_count, 2)
+    _, kwargs = self.mock_client.call_args
+    self.assertIs(
+        kwargs['http_options'], vertex_ai_client._POOLED_HTTP_OPTIONS
+    )
+
   def test_create_vertex_ai_client_failure(self):
     self.mock_client.side_effect = RuntimeError('Initialization failed')
     with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
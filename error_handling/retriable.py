@@ -0,0 +1,27 @@
+"""Classifies model errors that are worth retrying or falling back on."""
+
+from google.api_core import exceptions as api_core_exceptions
+from google.genai import errors as genai_errors
+
+# Errors raised when a model is throttled, over capacity or temporarily
+# failing, as opposed to rejecting the request itself.
+RETRIABLE_EXC = (
+    api_core_exceptions.TooManyRequests,
+    api_core_exceptions.ResourceExhausted,
+    api_core_exceptions.ServiceUnavailable,
+    api_core_exceptions.RetryError,
+    genai_errors.ServerError,
+)
+
+# The GenAI API reports exhausted quota as a ClientError with this status.
+_TOO_MANY_REQUESTS_STATUS_CODE = 429
+
+
+def is_retriable(error: Exception) -> bool:
+  """Returns True if the request may succeed when retried or sent elsewhere."""
+  if isinstance(error, RETRIABLE_EXC):
+    return True
+  return (
+      isinstance(error, genai_errors.APIError)
+      and error.code == _TOO_MANY_REQUESTS_STATUS_CODE
+  )
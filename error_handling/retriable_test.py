@@ -0,0 +1,43 @@
+"""Tests for retriable."""
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from google.api_core import exceptions as api_core_exceptions
+from google.genai import errors as genai_errors
+from opal_adk.error_handling import retriable
+
+
+class IsRetriableTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      (
+          'genai_rate_limited',
+          genai_errors.ClientError(429, {'error': {'message': 'quota'}}),
+          True,
+      ),
+      (
+          'genai_server_error',
+          genai_errors.ServerError(500, {'error': {'message': 'error'}}),
+          True,
+      ),
+      ('resource_exhausted', api_core_exceptions.ResourceExhausted('e'), True),
+      ('too_many_requests', api_core_exceptions.TooManyRequests('e'), True),
+      (
+          'service_unavailable',
+          api_core_exceptions.ServiceUnavailable('e'),
+          True,
+      ),
+      ('retry_error', api_core_exceptions.RetryError('e', None), True),
+      (
+          'genai_bad_request',
+          genai_errors.ClientError(400, {'error': {'message': 'bad'}}),
+          False,
+      ),
+      ('message_mentions_quota', ValueError('RESOURCE_EXHAUSTED'), False),
+  )
+  def test_is_retriable(self, error, expected):
+    self.assertEqual(retriable.is_retriable(error), expected)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -16,53 +16,44 @@ class ExecutorTest(parameterized.TestCase, unittest.IsolatedAsyncioTestCase):
   def setUp(self):
     super().setUp()
 
-    self.mock_session_service_patcher = mock.patch.object(
-        executor.in_memory_session_service,
-        'InMemorySessionService',
-        autospec=True,
+    self.mock_session_service_cls = self.enter_context(
+        mock.patch.object(
+            executor.in_memory_session_service,
+            'InMemorySessionService',
+            autospec=True,
+        )
+    )
+    self.mock_memory_service_cls = self.enter_context(
+        mock.patch.object(
+            executor.in_memory_memory_service,
+            'InMemoryMemoryService',
+            autospec=True,
+        )
+    )
+    self.mock_runner_cls = self.enter_context(
+        mock.patch.object(executor.runners, 'Runner', autospec=True)
+    )
+    self.mock_deep_research_workflow = self.enter_context(
+        mock.patch.object(
+            executor, 'deep_research_agent_workflow', autospec=True
+        )
+    )
+    self.mock_env = self.enter_context(
+        mock.patch(
+            'opal_adk.error_handling.opal_adk_error.environment_util.is_prod_environment',
+            return_value=True,
+        )
+    )
+    self.enter_context(
+        mock.patch.dict(
+            os.environ,
+            {
+                'GOOGLE_CLOUD_PROJECT': 'test_project',
+                'GOOGLE_CLOUD_LOCATION': 'test_location',
+                'GOOGLE_GENAI_USE_VERTEXAI': 'true',
+            },
+        )
     )
-    self.mock_session_service_cls = self.mock_session_service_patcher.start()
-    self.addCleanup(self.mock_session_service_patcher.stop)
-
-    self.mock_memory_service_patcher = mock.patch.object(
-        executor.in_memory_memory_service,
-        'InMemoryMemoryService',
-        autospec=True,
-    )
-    self.mock_memory_service_cls = self.mock_memory_service_patcher.start()
-    self.addCleanup(self.mock_memory_service_patcher.stop)
-
-    self.mock_runner_patcher = mock.patch.object(
-        executor.runners, 'Runner', autospec=True
-    )
-    self.mock_runner_cls = self.mock_runner_patcher.start()
-    self.addCleanup(self.mock_runner_patcher.stop)
-
-    self.mock_deep_research_workflow_patcher = mock.patch.object(
-        executor, 'deep_research_agent_workflow', autospec=True
-    )
-    self.mock_deep_research_workflow = (
-        self.mock_deep_research_workflow_patcher.start()
-    )
-    self.addCleanup(self.mock_deep_research_workflow_patcher.stop)
-
-    self.mock_env_patcher = mock.patch(
-        'opal_adk.error_handling.opal_adk_error.environment_util.is_prod_environment',
-        return_value=True,
-    )
-    self.mock_env = self.mock_env_patcher.start()
-    self.addCleanup(self.mock_env_patcher.stop)
-
-    self.env_patcher = mock.patch.dict(
-        os.environ,
-        {
-            'GOOGLE_CLOUD_PROJECT': 'test_project',
-            'GOOGLE_CLOUD_LOCATION': 'test_location',
-            'GOOGLE_GENAI_USE_VERTEXAI': 'true',
-        },
-    )
-    self.env_patcher.start()
-    self.addCleanup(self.env_patcher.stop)
 
     self.executor = executor.AgentExecutor()
 
@@ -1,6 +1,6 @@
 """Flags used across the Opal ADK."""
 
-from typing import NewType
+from typing import NewType, TypeVar
 from absl import flags
 
 ServiceAccount = NewType("ServiceAccount", str)
@@ -8,6 +8,10 @@ ProjectId = NewType("ProjectId", str)
 Location = NewType("Location", str)
 MapsAPIKey = NewType("MapsAPIKey", str)
 
+_T = TypeVar("_T")
+
+
+_FLAGS = flags.FLAGS
 
 _OPAL_ADK_GCP_SERVICE_ACCOUNT = flags.DEFINE_string(
     "opal_adk_gcp_service_account",
@@ -55,43 +59,43 @@ _OPAL_ADK_ENVIRONMENT = flags.DEFINE_string(
 )
 
 
+def _get_flag_value(flag: flags.FlagHolder[_T]) -> _T:
+  """Returns the value of a flag, or its default if flags are unparsed.
+
+  The is_parsed() check avoids raising and catching UnparsedFlagAccessError on
+  every read made before parsing. Nothing is cached, so flagsaver overrides and
+  set_default calls take effect immediately.
+
+  Args:
+    flag: The flag to read.
+
+  Returns:
+    The flag value.
+  """
+  if not _FLAGS.is_parsed():
+    return flag.default
+  return flag.value
+
+
 def get_service_account() -> ServiceAccount:
-  try:
-    return ServiceAccount(_OPAL_ADK_GCP_SERVICE_ACCOUNT.value)
-  except flags.UnparsedFlagAccessError:
-    return ServiceAccount(_OPAL_ADK_GCP_SERVICE_ACCOUNT.default)
+  return ServiceAccount(_get_flag_value(_OPAL_ADK_GCP_SERVICE_ACCOUNT))
 
 
 def get_location() -> Location:
-  try:
-    return Location(_OPAL_ADK_GCP_LOCATION.value)
-  except flags.UnparsedFlagAccessError:
-    return Location(_OPAL_ADK_GCP_LOCATION.default)
+  return Location(_get_flag_value(_OPAL_ADK_GCP_LOCATION))
 
 
 def get_project_id() -> ProjectId:
-  try:
-    return ProjectId(_OPAL_ADK_GCP_PROJECT_ID.value)
-  except flags.UnparsedFlagAccessError:
-    return ProjectId(_OPAL_ADK_GCP_PROJECT_ID.default)
+  return ProjectId(_get_flag_value(_OPAL_ADK_GCP_PROJECT_ID))
 
 
 def get_maps_api_key() -> MapsAPIKey:
-  try:
-    return MapsAPIKey(_OPAL_ADK_MAPS_API_KEY.value)
-  except flags.UnparsedFlagAccessError:
-    return MapsAPIKey(_OPAL_ADK_MAPS_API_KEY.default)
+  return MapsAPIKey(_get_flag_value(_OPAL_ADK_MAPS_API_KEY))
 
 
 def get_debug_logging() -> bool:
-  try:
-    return _OPAL_ADK_DEBUG_LOGGING.value
-  except flags.UnparsedFlagAccessError:
-    return _OPAL_ADK_DEBUG_LOGGING.default
+  return _get_flag_value(_OPAL_ADK_DEBUG_LOGGING)
 
 
 def get_opal_adk_environment() -> str:
-  try:
-    return _OPAL_ADK_ENVIRONMENT.value
-  except flags.UnparsedFlagAccessError:
-    return _OPAL_ADK_ENVIRONMENT.default
+  return _get_flag_value(_OPAL_ADK_ENVIRONMENT)
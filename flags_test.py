@@ -1,76 +1,97 @@
 """Tests for flags.py."""
 
-import sys
 from unittest import mock
-from absl import flags
+from absl import flags as absl_flags
 from absl.testing import absltest
+from absl.testing import flagsaver
 from opal_adk import flags as opal_flags
 
+FLAGS = absl_flags.FLAGS
+
+
+def _unparsed_flags():
+  """Returns a patcher that makes opal_flags see unparsed absl flags."""
+  return mock.patch.object(
+      opal_flags, "_FLAGS", **{"is_parsed.return_value": False}
+  )
+
 
 class FlagsTest(absltest.TestCase):
 
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    # Parse a synthetic argv once rather than relying on sys.argv.
+    if not FLAGS.is_parsed():
+      FLAGS(["flags_test"])
+      cls.addClassCleanup(FLAGS.unparse_flags)
+
+  @flagsaver.flagsaver(opal_adk_gcp_service_account="test_service_account")
   def test_get_service_account_success(self):
-    with mock.patch.object(
-        opal_flags, "_OPAL_ADK_GCP_SERVICE_ACCOUNT"
-    ) as mock_flag:
-      mock_flag.value = "test_service_account"
-      self.assertEqual(opal_flags.get_service_account(), "test_service_account")
+    self.assertEqual(opal_flags.get_service_account(), "test_service_account")
 
   def test_get_service_account_unparsed(self):
-    with mock.patch.object(
-        opal_flags, "_OPAL_ADK_GCP_SERVICE_ACCOUNT"
-    ) as mock_flag:
-      type(mock_flag).value = mock.PropertyMock(
-          side_effect=flags.UnparsedFlagAccessError("msg")
-      )
-      mock_flag.default = None
+    with _unparsed_flags():
       self.assertIsNone(opal_flags.get_service_account())
 
+  @flagsaver.flagsaver(opal_adk_gcp_location="test_location")
   def test_get_location_success(self):
-    with mock.patch.object(opal_flags, "_OPAL_ADK_GCP_LOCATION") as mock_flag:
-      mock_flag.value = "test_location"
-      self.assertEqual(opal_flags.get_location(), "test_location")
+    self.assertEqual(opal_flags.get_location(), "test_location")
 
   def test_get_location_unparsed(self):
-    with mock.patch.object(opal_flags, "_OPAL_ADK_GCP_LOCATION") as mock_flag:
-      type(mock_flag).value = mock.PropertyMock(
-          side_effect=flags.UnparsedFlagAccessError("msg")
-      )
-      mock_flag.default = None
+    with _unparsed_flags():
       self.assertIsNone(opal_flags.get_location())
 
+  @flagsaver.flagsaver(opal_adk_gcp_project_id="test_project_id")
   def test_get_project_id_success(self):
-    with mock.patch.object(opal_flags, "_OPAL_ADK_GCP_PROJECT_ID") as mock_flag:
-      mock_flag.value = "test_project_id"
-      self.assertEqual(opal_flags.get_project_id(), "test_project_id")
+    self.assertEqual(opal_flags.get_project_id(), "test_project_id")
 
   def test_get_project_id_unparsed(self):
-    with mock.patch.object(opal_flags, "_OPAL_ADK_GCP_PROJECT_ID") as mock_flag:
-      type(mock_flag).value = mock.PropertyMock(
-          side_effect=flags.UnparsedFlagAccessError("msg")
-      )
-      mock_flag.default = None
+    with _unparsed_flags():
       self.assertIsNone(opal_flags.get_project_id())
 
+  @flagsaver.flagsaver(opal_adk_maps_api_key="test_api_key")
   def test_get_maps_api_key_success(self):
-    with mock.patch.object(opal_flags, "_OPAL_ADK_MAPS_API_KEY") as mock_flag:
-      mock_flag.value = "test_api_key"
-      self.assertEqual(opal_flags.get_maps_api_key(), "test_api_key")
+    self.assertEqual(opal_flags.get_maps_api_key(), "test_api_key")
 
   def test_get_maps_api_key_unparsed(self):
-    with mock.patch.object(opal_flags, "_OPAL_ADK_MAPS_API_KEY") as mock_flag:
-      type(mock_flag).value = mock.PropertyMock(
-          side_effect=flags.UnparsedFlagAccessError("msg")
-      )
-      mock_flag.default = None
+    with _unparsed_flags():
       self.assertIsNone(opal_flags.get_maps_api_key())
 
+  @flagsaver.flagsaver(opal_adk_debug_logging=True)
+  def test_get_debug_logging_success(self):
+    self.assertTrue(opal_flags.get_debug_logging())
+
+  def test_get_debug_logging_unparsed(self):
+    with _unparsed_flags():
+      self.assertFalse(opal_flags.get_debug_logging())
+
+  @flagsaver.flagsaver(opal_adk_environment="prod")
+  def test_get_opal_adk_environment_success(self):
+    self.assertEqual(opal_flags.get_opal_adk_environment(), "prod")
+
+  def test_get_opal_adk_environment_unparsed(self):
+    with _unparsed_flags():
+      self.assertEqual(opal_flags.get_opal_adk_environment(), "dev")
+
+  def test_get_service_account_reads_current_value(self):
+    with flagsaver.flagsaver(opal_adk_gcp_service_account="first_sa"):
+      self.assertEqual(opal_flags.get_service_account(), "first_sa")
+    with flagsaver.flagsaver(opal_adk_gcp_service_account="second_sa"):
+      self.assertEqual(opal_flags.get_service_account(), "second_sa")
+
+  @flagsaver.flagsaver(opal_adk_gcp_service_account="parsed_service_account")
+  def test_get_service_account_does_not_cache_default(self):
+    with _unparsed_flags():
+      self.assertIsNone(opal_flags.get_service_account())
+    self.assertEqual(opal_flags.get_service_account(), "parsed_service_account")
+
+
+  def test_get_location_unparsed_reads_current_default(self):
+    self.enter_context(flagsaver.flagsaver())
+    FLAGS.set_default("opal_adk_gcp_location", "default_location")
+    with _unparsed_flags():
+      self.assertEqual(opal_flags.get_location(), "default_location")
 
 if __name__ == "__main__":
-  # Provide dummy values for required flags to satisfy absl parsing.
-  sys.argv.extend([
-      "--opal_adk_gcp_service_account=dummy",
-      "--opal_adk_gcp_location=dummy",
-      "--opal_adk_gcp_project_id=dummy",
-  ])
   absltest.main()
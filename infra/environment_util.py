@@ -4,6 +4,8 @@ import logging
 
 from opal_adk import flags
 
+_AUTOPUSH_OR_STAGING = frozenset(('staging', 'autopush'))
+
 
 def get_opal_adk_environment() -> str:
   """Returns the Opal ADK environment."""
@@ -22,7 +24,7 @@ def is_staging_environment() -> bool:
 
 def is_autopush_or_staging() -> bool:
   """Returns True if the current environment is staging."""
-  return flags.get_opal_adk_environment() in ('staging', 'autopush')
+  return flags.get_opal_adk_environment() in _AUTOPUSH_OR_STAGING
 
 
 def log_if_not_staging(message: str, *args) -> None:
@@ -4,6 +4,8 @@ from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
+from opal_adk import flags
+from opal_adk.infra import environment_util
 
 
 class EnvironmentUtilTest(parameterized.TestCase):
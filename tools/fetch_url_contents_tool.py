@@ -1,38 +1,90 @@
 """Fetches the contents of a URL
 """
 
+import asyncio
+import collections
 import logging
+import time
 from typing import Optional
 import html2text
 import requests
+from requests import adapters
 from google.adk.tools import base_tool
 from google.adk.tools import tool_context
 from google.rpc import code_pb2
 from opal_adk.error_handling import opal_adk_error
 
 
-def _convert_to_markdown(site_contents: str) -> str:
-  """Fetches the contents of a URL and returns them as markdown.
+# (connect, read) timeouts in seconds for fetching a URL.
+_FETCH_TIMEOUT_SECONDS = (5, 30)
+
+# Shared across calls so repeated fetches reuse pooled keep-alive connections
+# instead of paying a new TCP and TLS handshake each time.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://", adapters.HTTPAdapter(pool_connections=10, pool_maxsize=50)
+)
+_SESSION.mount(
+    "http://", adapters.HTTPAdapter(pool_connections=10, pool_maxsize=50)
+)
+
+# Recently fetched pages, keyed by URL, so an agent revisiting a page doesn't
+# fetch it again. Entries hold (fetch time, markdown) and expire after a few
+# minutes to bound staleness. Only touched from the event loop thread.
+_MAX_CACHED_URLS = 128
+_CACHE_TTL_SECONDS = 300
+_markdown_cache: collections.OrderedDict[str, tuple[float, str]] = (
+    collections.OrderedDict()
+)
 
-  This method fetches the HTML content of the given URL using `fetch_url`
-  and then converts the HTML to markdown using the `html2text` library.
+def _convert_to_markdown(site_contents: str) -> str:
+  """Converts the HTML contents of a site to markdown.
 
   Args:
-    site_contents: The URL to fetch.
+    site_contents: The HTML contents of the site.
 
   Returns:
-    The contents of the URL converted to markdown.
-
-  Raises:
-    requests.exceptions.RequestException: If the URL cannot be fetched.
+    The site contents converted to markdown.
   """
+  # HTML2Text keeps parser state, such as an unclosed <pre> or <script>, between
+  # handle() calls and is not thread-safe, so each page gets its own converter.
+  # Building one takes microseconds next to fetching the page.
   h = html2text.HTML2Text()
   # Configure html2text to keep links and other formatting.
   h.ignore_links = False
   h.ignore_images = False
   h.body_width = 0  # Disable line wrapping
-  markdown_content = h.handle(site_contents)
-  return markdown_content
+  return h.handle(site_contents)
+
+
+def _fetch_site_contents(url: str) -> str:
+  """Fetches the raw contents of a URL, blocking until the response arrives.
+
+  Args:
+    url: The URL to fetch.
+
+  Returns:
+    The body of the response as text.
+
+  Raises:
+    opal_adk_error.OpalAdkError: If the URL cannot be fetched.
+  """
+  try:
+    response = _SESSION.get(url, timeout=_FETCH_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    # Decode the body once ourselves: response.text falls back to charset
+    # detection over the whole body when the server declares no encoding.
+    return response.content.decode(
+        response.encoding or "utf-8", errors="replace"
+    )
+  except requests.exceptions.RequestException as e:
+    logging.info("fetch_url_contents_tool: failed to fetch url with exception: %s", e)
+    raise opal_adk_error.OpalAdkError(
+        logged=f"fetch_url_contents_tool: failed to fetch url with exception: {e}",
+        status_message="Failed to fetch URL contents",
+        status_code=code_pb2.UNAVAILABLE,
+        details=str(e),
+    ) from e
 
 
 class FetchUrlContentsTool(base_tool.BaseTool):
@@ -47,13 +99,16 @@ class FetchUrlContentsTool(base_tool.BaseTool):
         ),
     )
 
-  def __call__(
+  async def __call__(
       self, url: str, context: Optional[tool_context.ToolContext] = None
   ) -> str:
     """Fetches the contents of a URL.
 
-    This method attempts to fetch the contents of the given URL. It uses the
-    requests library.
+    This method attempts to fetch the contents of the given URL. It uses a
+    shared requests session so connections are reused across calls. The
+    blocking request runs in a worker thread so concurrent fetches overlap
+    instead of stalling the event loop. Recently fetched URLs are served from
+    a small in-memory cache.
 
     Args:
       url: The URL to fetch.
@@ -63,20 +118,21 @@ class FetchUrlContentsTool(base_tool.BaseTool):
       The contents of the URL as a string.
 
     Raises:
-      requests.exceptions.RequestException: If the URL cannot be fetched.
+      opal_adk_error.OpalAdkError: If the URL cannot be fetched.
     """
-    try:
-      response = requests.get(url)
-      response.raise_for_status()
-      return _convert_to_markdown(response.text)
-    except requests.exceptions.RequestException as e:
-      logging.info("fetch_url_contents_tool: failed to fetch url with exception: %s", e)
-      raise opal_adk_error.OpalAdkError(
-          logged=f"fetch_url_contents_tool: failed to fetch url with exception: {e}",
-          status_message="Failed to fetch URL contents",
-          status_code=code_pb2.UNAVAILABLE,
-          details=str(e),
-      ) from e
+    now = time.monotonic()
+    cached = _markdown_cache.get(url)
+    if cached is not None and now - cached[0] < _CACHE_TTL_SECONDS:
+      _markdown_cache.move_to_end(url)
+      return cached[1]
+
+    site_contents = await asyncio.to_thread(_fetch_site_contents, url)
+    markdown_content = _convert_to_markdown(site_contents)
+    _markdown_cache[url] = (now, markdown_content)
+    _markdown_cache.move_to_end(url)
+    if len(_markdown_cache) > _MAX_CACHED_URLS:
+      _markdown_cache.popitem(last=False)
+    return markdown_content
 
 
 fetch_url = FetchUrlContentsTool()
@@ -1,5 +1,6 @@
 """Unit tests for fetch_url_contents."""
 
+import unittest
 from unittest import mock
 from absl.testing import absltest
 from opal_adk.error_handling import opal_adk_error
@@ -7,32 +8,40 @@ from opal_adk.tools import fetch_url_contents_tool
 import requests
 
 
-class FetchUrlContentsTest(absltest.TestCase):
+class FetchUrlContentsTest(absltest.TestCase, unittest.IsolatedAsyncioTestCase):
 
-  @mock.patch('requests.get')
-  def test_fetch_url_success(self, mock_get):
+  def setUp(self):
+    super().setUp()
+    fetch_url_contents_tool._markdown_cache.clear()
+    self.addCleanup(fetch_url_contents_tool._markdown_cache.clear)
+
+  @mock.patch.object(fetch_url_contents_tool._SESSION, 'get', autospec=True)
+  async def test_fetch_url_success(self, mock_get):
     """Tests that fetch_url returns markdown content on success."""
     mock_response = mock.Mock()
-    mock_response.text = (
-        '<html><body><h1>Test</h1><p>Some text</p>'
-        '<a href="http://link.com">link</a>'
-        '<img src="http://image.com/img.png" alt="alt text"></body></html>'
+    mock_response.content = (
+        b'<html><body><h1>Test</h1><p>Some text</p>'
+        b'<a href="http://link.com">link</a>'
+        b'<img src="http://image.com/img.png" alt="alt text"></body></html>'
     )
+    mock_response.encoding = 'utf-8'
     mock_response.raise_for_status.return_value = None
     mock_get.return_value = mock_response
 
     url = 'http://example.com'
-    result = fetch_url_contents_tool.fetch_url(url)
+    result = await fetch_url_contents_tool.fetch_url(url)
 
-    mock_get.assert_called_once_with(url)
+    mock_get.assert_called_once_with(
+        url, timeout=fetch_url_contents_tool._FETCH_TIMEOUT_SECONDS
+    )
     mock_response.raise_for_status.assert_called_once()
     self.assertIn('# Test', result)
     self.assertIn('Some text', result)
     self.assertIn('[link](http://link.com)', result)
     self.assertIn('![alt text](http://image.com/img.png)', result)
 
-  @mock.patch('requests.get')
-  def test_fetch_url_failure(self, mock_get):
+  @mock.patch.object(fetch_url_contents_tool._SESSION, 'get', autospec=True)
+  async def test_fetch_url_failure(self, mock_get):
     """Tests that fetch_url raises an exception on failure."""
     mock_get.side_effect = requests.exceptions.RequestException(
         'Failed to fetch'
@@ -40,9 +49,61 @@ class FetchUrlContentsTest(absltest.TestCase):
 
     url = 'http://example.com'
     with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
-      fetch_url_contents_tool.fetch_url(url)
+      await fetch_url_contents_tool.fetch_url(url)
     self.assertIn('Failed to fetch', str(cm.exception.details))
 
+  @mock.patch.object(fetch_url_contents_tool._SESSION, 'get', autospec=True)
+  async def test_fetch_url_defaults_to_utf8_without_declared_encoding(
+      self, mock_get
+  ):
+    """Tests that a body without a declared encoding is decoded as UTF-8."""
+    mock_response = mock.Mock()
+    mock_response.content = '<p>Caf\u00e9</p>'.encode('utf-8')
+    mock_response.encoding = None
+    mock_response.raise_for_status.return_value = None
+    mock_get.return_value = mock_response
+
+    result = await fetch_url_contents_tool.fetch_url('http://example.com')
+
+    self.assertIn('Caf\u00e9', result)
+
+  @mock.patch.object(fetch_url_contents_tool._SESSION, 'get', autospec=True)
+  async def test_fetch_url_caches_by_url(self, mock_get):
+    """Tests that a repeated fetch of the same URL is served from the cache."""
+    mock_response = mock.Mock()
+    mock_response.content = b'<html><body><p>Cached page</p></body></html>'
+    mock_response.encoding = 'utf-8'
+    mock_response.raise_for_status.return_value = None
+    mock_get.return_value = mock_response
+
+    url = 'http://example.com'
+    first = await fetch_url_contents_tool.fetch_url(url)
+    second = await fetch_url_contents_tool.fetch_url(url)
+
+    mock_get.assert_called_once()
+    self.assertEqual(first, second)
+    self.assertIn('Cached page', second)
+
+  @mock.patch.object(fetch_url_contents_tool._SESSION, 'get', autospec=True)
+  async def test_fetch_url_refetches_expired_entry(self, mock_get):
+    """Tests that a cached page is fetched again once its entry expires."""
+    mock_response = mock.Mock()
+    mock_response.content = b'<p>Page</p>'
+    mock_response.encoding = 'utf-8'
+    mock_response.raise_for_status.return_value = None
+    mock_get.return_value = mock_response
+
+    url = 'http://example.com'
+    await fetch_url_contents_tool.fetch_url(url)
+    fetched_at, markdown = fetch_url_contents_tool._markdown_cache[url]
+    fetch_url_contents_tool._markdown_cache[url] = (
+        fetched_at - fetch_url_contents_tool._CACHE_TTL_SECONDS - 1,
+        markdown,
+    )
+    await fetch_url_contents_tool.fetch_url(url)
+
+    self.assertEqual(mock_get.call_count, 2)
+
   def test_convert_to_markdown(self):
     """Tests that convert_to_markdown converts HTML to markdown."""
     html_content = '<html><body><h1>Title</h1><p>Hello world!</p></body></html>'
@@ -50,8 +111,29 @@ class FetchUrlContentsTest(absltest.TestCase):
     result = fetch_url_contents_tool._convert_to_markdown(html_content)
     self.assertEqual(expected_markdown.strip(), result.strip())
 
-  @mock.patch('requests.get')
-  def test_fetch_url_raises_for_status(self, mock_get):
+  def test_convert_to_markdown_reused_converter_has_no_stale_output(self):
+    """Tests that consecutive conversions don't leak earlier output."""
+    fetch_url_contents_tool._convert_to_markdown('<p>First page</p>')
+    result = fetch_url_contents_tool._convert_to_markdown('<p>Second page</p>')
+    self.assertNotIn('First page', result)
+    self.assertIn('Second page', result)
+
+  def test_convert_to_markdown_unclosed_tags_do_not_affect_next_page(self):
+    """Tests that a malformed page doesn't change how the next one converts."""
+    expected = fetch_url_contents_tool._convert_to_markdown(
+        '<p>Second <b>page</b></p>'
+    )
+    fetch_url_contents_tool._convert_to_markdown('<pre>code <script>var x')
+
+    result = fetch_url_contents_tool._convert_to_markdown(
+        '<p>Second <b>page</b></p>'
+    )
+
+    self.assertEqual(result, expected)
+    self.assertIn('Second **page**', result)
+
+  @mock.patch.object(fetch_url_contents_tool._SESSION, 'get', autospec=True)
+  async def test_fetch_url_raises_for_status(self, mock_get):
     """Tests that fetch_url raises an exception if raise_for_status does."""
     mock_response = mock.Mock()
     mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
@@ -61,7 +143,7 @@ class FetchUrlContentsTest(absltest.TestCase):
 
     url = 'http://example.com/404'
     with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
-      fetch_url_contents_tool.fetch_url(url)
+      await fetch_url_contents_tool.fetch_url(url)
     self.assertIn('404 Not Found', str(cm.exception.details))
 
 
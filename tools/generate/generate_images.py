@@ -1,5 +1,7 @@
 """Module for generating images using Gemini models with consistency constraints."""
 
+import asyncio
+import re
 from typing import Any
 from google.adk.tools import tool_context as tc
 from google.genai import types
@@ -7,6 +9,7 @@ from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools.generate.generate_utils import gemini_generate_image
 from opal_adk.types import image_types
 from opal_adk.types import models
+from opal_adk.util import per_loop_semaphore
 from google.rpc import code_pb2
 
 ToolContext = tc.ToolContext
@@ -26,13 +29,63 @@ For example:
 Pay careful attention to the exact number of images requested and ensure you generate that many separate images.
 
 """
-
+# A prompt clearly asks for a single image when it names one image (e.g. "an
+# image of three cats") and mentions nothing that suggests several, such as a
+# plural image noun or a series. Only those prompts are sent without the
+# prefix; anything ambiguous keeps it.
+_SINGLE_IMAGE_PATTERN = re.compile(
+    r'\b(?:an?|one|1|single)\s+(?:\w+\s+)?(?:image|picture|photo'
+    r'|illustration|drawing|logo|poster|icon)\b',
+    re.IGNORECASE,
+)
+_MULTIPLE_IMAGES_HINT_PATTERN = re.compile(
+    r'\b(?:images|scenes|pictures|photos|frames|keyframes|illustrations'
+    r'|drawings|storyboards?|series|sequence|set|collection|variations)\b',
+    re.IGNORECASE,
+)
+# Built once and shared: the prefix is sent as its own text part ahead of the
+# caller's prompt rather than concatenated into a new string on every call.
+_AI_IMAGE_TOOL_PREFIX_PART = types.Part.from_text(text=_AI_IMAGE_TOOL_PREFIX)
+# Sent instead of the prefix when num_images fans out into separate requests,
+# each of which should return a single image.
+_SINGLE_IMAGE_PART = types.Part.from_text(
+    text=(
+        'Generate exactly one standalone image for the request below. It is one'
+        ' of several independent requests for the same prompt, so do not'
+        ' combine multiple images into one.\n\n'
+    )
+)
+# Upper bound on image requests in flight across all generate_images calls in
+# this process. Image models have a low per-minute quota, so excess requests
+# queue here instead of being rejected with 429s.
+_MAX_CONCURRENT_IMAGE_REQUESTS = 4
+_IMAGE_REQUEST_SEMAPHORE = per_loop_semaphore.PerLoopSemaphore(
+    _MAX_CONCURRENT_IMAGE_REQUESTS
+)
+_ASPECT_RATIOS = {
+    aspect_ratio.value: aspect_ratio for aspect_ratio in image_types.AspectRatio
+}
+# Maps the model option straight to the image model name, so validating and
+# resolving the model is a single lookup.
+_IMAGE_MODEL_NAMES = {
+    simple_model.value: models.simple_model_to_image_model(simple_model).value
+    for simple_model in models.SimpleModel
+}
+
+
+def _is_single_image_request(prompt: str) -> bool:
+  """Returns True if the prompt clearly asks for exactly one image."""
+  return bool(
+      _SINGLE_IMAGE_PATTERN.search(prompt)
+      and not _MULTIPLE_IMAGES_HINT_PATTERN.search(prompt)
+  )
 
 async def generate_images(
     prompt: str,
     model: str,
     aspect_ratio: str,
     tool_context: ToolContext,
+    num_images: int = 1,
 ) -> dict[str, Any]:
   """Generates one or more images based on a prompt and optionally.
 
@@ -66,13 +119,23 @@ async def generate_images(
       ["1:1", "3:4", "4:3", "9:16", "16:9"].
     tool_context: ToolContext passed as part of the ADK tool execution. This
       will contain any images that were added by the user as a reference.
+    num_images: The number of independent image generation requests to make
+      with the same prompt. Use a value greater than 1 when you need several
+      separate variations of the same request rather than asking the model for
+      many images in a single response, which may be truncated. Each of these
+      requests is asked for exactly one image, so the prompt should then
+      describe a single image; to ask for several images in the prompt itself,
+      leave this at 1.
 
   Returns:
-    A dict containing the status, message and dictionary of image metadata.
+    A dict containing the status, message and image metadata. The metadata's
+    image_name and mime_type describe the last generated image; when more than
+    one image is generated, "images" lists an image_name/mime_type entry for
+    each of them.
   """
-  try:
-    simple_model = models.SimpleModel(model)
-  except ValueError:
+  # Validate every argument before any awaits or prompt building.
+  model_name = _IMAGE_MODEL_NAMES.get(model)
+  if model_name is None:
     raise opal_adk_error.OpalAdkError(
         status_code=code_pb2.INVALID_ARGUMENT,
         status_message=(
@@ -81,33 +144,87 @@ async def generate_images(
         ),
     )
 
-  model_name = models.simple_model_to_image_model(simple_model).value
+  parsed_aspect_ratio = _ASPECT_RATIOS.get(aspect_ratio)
+  if parsed_aspect_ratio is None:
+    raise opal_adk_error.OpalAdkError(
+        status_code=code_pb2.INVALID_ARGUMENT,
+        status_message=(
+            f'generate_images: Invalid aspect ratio: {aspect_ratio}, expected'
+            f' one of {list(_ASPECT_RATIOS)}'
+        ),
+    )
 
-  parsed_aspect_ratio = image_types.AspectRatio(aspect_ratio)
+  if num_images < 1:
+    raise opal_adk_error.OpalAdkError(
+        status_code=code_pb2.INVALID_ARGUMENT,
+        status_message=(
+            f'generate_images: num_images must be at least 1, got {num_images}'
+        ),
+    )
 
-  all_parts = [types.Part.from_text(text=_AI_IMAGE_TOOL_PREFIX + prompt)]
   input_images = await tool_context.load_artifact(_INPUT_IMAGE_KEY)
+  all_parts = [types.Part.from_text(text=prompt)]
+  if num_images > 1:
+    all_parts.insert(0, _SINGLE_IMAGE_PART)
+  elif input_images or not _is_single_image_request(prompt):
+    # The prefix also asks for consistency with the reference images, so it is
+    # kept whenever they are passed.
+    all_parts.insert(0, _AI_IMAGE_TOOL_PREFIX_PART)
   if input_images:
     all_parts.append(input_images)
 
-  generated_images = gemini_generate_image.gemini_generate_images(
-      parts=all_parts,
-      aspect_ratio=parsed_aspect_ratio,
-      model_name=model_name,
-  )
-
-  metadata = {}
-  for i, (image_bytes, mime_type) in enumerate(generated_images):
-    image = types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
-    image_name = 'output_image_' + str(i)
-    tool_context.save_artifact(filename=image_name, artifact=image)
-    metadata['image_name'] = image_name
-    metadata['mime_type'] = mime_type
+  async def _generate() -> list[tuple[bytes, str]]:
+    # The Gemini call is blocking; run it off the event loop so other tool
+    # calls can make progress while the image is generated.
+    async with _IMAGE_REQUEST_SEMAPHORE:
+      return await asyncio.to_thread(
+          gemini_generate_image.gemini_generate_images,
+          parts=all_parts,
+          aspect_ratio=parsed_aspect_ratio,
+          model_name=model_name,
+      )
+
+  results = await asyncio.gather(*(_generate() for _ in range(num_images)))
+  generated_images = [image for result in results for image in result]
+
+  image_names = ['output_image_' + str(i) for i in range(len(generated_images))]
+  # Artifact writes are independent, so issue them together rather than
+  # waiting on each in turn.
+  await asyncio.gather(*(
+      tool_context.save_artifact(
+          filename=image_name,
+          artifact=types.Part.from_bytes(data=image_bytes, mime_type=mime_type),
+      )
+      for image_name, (image_bytes, mime_type) in zip(
+          image_names, generated_images
+      )
+  ))
+
+  last_image_name = image_names[-1]
+  _, last_mime_type = generated_images[-1]
+  # The image_name and mime_type keys describe the last image, as they always
+  # have; the full list is only added when there are several images.
+  metadata = {'image_name': last_image_name, 'mime_type': last_mime_type}
+  if len(generated_images) == 1:
     tool_context.state['image_generated'] = (
         'Successfully generated and stored an image with image_name:'
-        f' {image_name} and mime_type: {mime_type}.  The prompt used '
+        f' {last_image_name} and mime_type: {last_mime_type}.  The prompt used '
         f'for image generation was: {prompt}'
     )
+  else:
+    metadata['images'] = [
+        {'image_name': image_name, 'mime_type': mime_type}
+        for image_name, (_, mime_type) in zip(image_names, generated_images)
+    ]
+    stored_images = ', '.join(
+        f'{image["image_name"]} (mime_type: {image["mime_type"]})'
+        for image in metadata['images']
+    )
+    tool_context.state['image_generated'] = (
+        f'Successfully generated and stored {len(image_names)} images:'
+        f' {stored_images}.  The prompt used for image generation was:'
+        f' {prompt}'
+    )
 
   return {
       'status': 'success',
@@ -1,18 +1,24 @@
+import threading
+import time
 import unittest
 from unittest import mock
 
 from absl.testing import absltest
+from absl.testing import parameterized
 from google.adk.tools import tool_context
 from google.genai import types
 from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools.generate import generate_images
 from opal_adk.tools.generate.generate_utils import gemini_generate_image
 from opal_adk.types import image_types
+from opal_adk.util import per_loop_semaphore
 
 from google.rpc import code_pb2
 
 
-class GenerateImagesTest(absltest.TestCase, unittest.IsolatedAsyncioTestCase):
+class GenerateImagesTest(
+    parameterized.TestCase, unittest.IsolatedAsyncioTestCase
+):
 
   def setUp(self):
     super().setUp()
@@ -41,7 +47,7 @@ class GenerateImagesTest(absltest.TestCase, unittest.IsolatedAsyncioTestCase):
     )
 
     result = await generate_images.generate_images(
-        prompt='A cool cat',
+        prompt='Generate 2 images of a cool cat',
         model='pro',
         aspect_ratio='16:9',
         tool_context=self.mock_tool_context,
@@ -51,8 +57,16 @@ class GenerateImagesTest(absltest.TestCase, unittest.IsolatedAsyncioTestCase):
     self.assertEqual(result['message'], 'Successfully generated images')
     self.assertEqual(result['metadata']['image_name'], 'output_image_1')
     self.assertEqual(result['metadata']['mime_type'], 'image/jpeg')
+    self.assertEqual(
+        result['metadata']['images'],
+        [
+            {'image_name': 'output_image_0', 'mime_type': 'image/png'},
+            {'image_name': 'output_image_1', 'mime_type': 'image/jpeg'},
+        ],
+    )
 
     self.assertEqual(self.mock_tool_context.save_artifact.call_count, 2)
+    self.assertEqual(self.mock_tool_context.save_artifact.await_count, 2)
     # Check first save_artifact call
     _, kwargs1 = self.mock_tool_context.save_artifact.call_args_list[0]
     self.assertEqual(kwargs1['filename'], 'output_image_0')
@@ -67,13 +81,18 @@ class GenerateImagesTest(absltest.TestCase, unittest.IsolatedAsyncioTestCase):
     _, kwargs = mock_generate_image.call_args
     self.assertEqual(kwargs['model_name'], 'gemini-3-pro-image-opal')
     self.assertEqual(kwargs['aspect_ratio'], image_types.AspectRatio('16:9'))
-    self.assertLen(kwargs['parts'], 2)
-    self.assertIn('A cool cat', kwargs['parts'][0].text)
-    self.assertEqual(kwargs['parts'][1].inline_data.data, b'input1')
-    self.assertIn(
-        'Successfully generated and stored an image',
-        self.mock_tool_context.state['image_generated'],
+    self.assertLen(kwargs['parts'], 3)
+    self.assertIs(
+        kwargs['parts'][0], generate_images._AI_IMAGE_TOOL_PREFIX_PART
+    )
+    self.assertEqual(
+        kwargs['parts'][1].text, 'Generate 2 images of a cool cat'
     )
+    self.assertEqual(kwargs['parts'][2].inline_data.data, b'input1')
+    state_message = self.mock_tool_context.state['image_generated']
+    self.assertIn('Successfully generated and stored 2 images', state_message)
+    self.assertIn('output_image_0 (mime_type: image/png)', state_message)
+    self.assertIn('output_image_1 (mime_type: image/jpeg)', state_message)
 
   @mock.patch.object(
       gemini_generate_image,
@@ -88,25 +107,217 @@ class GenerateImagesTest(absltest.TestCase, unittest.IsolatedAsyncioTestCase):
     self.mock_tool_context.load_artifact = mock.AsyncMock(return_value=None)
 
     result = await generate_images.generate_images(
-        prompt='A cool dog',
+        prompt='An image of a cool dog',
         model='flash',
         aspect_ratio='1:1',
         tool_context=self.mock_tool_context,
     )
 
     self.assertEqual(result['status'], 'success')
+    self.assertEqual(
+        result['metadata'],
+        {'image_name': 'output_image_0', 'mime_type': 'image/png'},
+    )
 
     mock_generate_image.assert_called_once()
     _, kwargs = mock_generate_image.call_args
     self.assertEqual(kwargs['model_name'], 'gemini-2.5-flash-image')
     self.assertEqual(kwargs['aspect_ratio'], image_types.AspectRatio('1:1'))
     self.assertLen(kwargs['parts'], 1)
+    self.assertEqual(kwargs['parts'][0].text, 'An image of a cool dog')
+    self.mock_tool_context.save_artifact.assert_awaited_once()
     self.assertIn(
-        'Successfully generated and stored an image',
+        'Successfully generated and stored an image with image_name:'
+        ' output_image_0',
         self.mock_tool_context.state['image_generated'],
     )
 
+  @mock.patch.object(
+      gemini_generate_image,
+      'gemini_generate_images',
+      autospec=True,
+  )
+  async def test_generate_images_runs_off_event_loop_thread(
+      self, mock_generate_image
+  ):
+    calling_threads = []
+
+    def _generate(**unused_kwargs):
+      calling_threads.append(threading.get_ident())
+      return [(b'image1', 'image/png')]
+
+    mock_generate_image.side_effect = _generate
+    self.mock_tool_context.load_artifact = mock.AsyncMock(return_value=None)
+
+    await generate_images.generate_images(
+        prompt='A cool dog',
+        model='flash',
+        aspect_ratio='1:1',
+        tool_context=self.mock_tool_context,
+    )
+
+    self.assertLen(calling_threads, 1)
+    self.assertNotEqual(calling_threads[0], threading.get_ident())
+
+  @mock.patch.object(
+      gemini_generate_image,
+      'gemini_generate_images',
+      autospec=True,
+  )
+  async def test_generate_images_fans_out_num_images(self, mock_generate_image):
+    mock_generate_image.side_effect = [
+        [(b'image1', 'image/png')],
+        [(b'image2', 'image/png'), (b'image3', 'image/jpeg')],
+        [(b'image4', 'image/png')],
+    ]
+    self.mock_tool_context.load_artifact = mock.AsyncMock(return_value=None)
+
+    result = await generate_images.generate_images(
+        prompt='A cool dog',
+        model='flash',
+        aspect_ratio='1:1',
+        tool_context=self.mock_tool_context,
+        num_images=3,
+    )
+
+    self.assertEqual(mock_generate_image.call_count, 3)
+    for _, kwargs in mock_generate_image.call_args_list:
+      # Each fanned-out request asks for a single image.
+      self.assertEqual(
+          kwargs['parts'],
+          [generate_images._SINGLE_IMAGE_PART, mock.ANY],
+      )
+    self.assertEqual(result['metadata']['image_name'], 'output_image_3')
+    self.assertEqual(
+        [image['image_name'] for image in result['metadata']['images']],
+        [
+            'output_image_0',
+            'output_image_1',
+            'output_image_2',
+            'output_image_3',
+        ],
+    )
+    self.assertEqual(self.mock_tool_context.save_artifact.await_count, 4)
+
+  @mock.patch.object(
+      gemini_generate_image,
+      'gemini_generate_images',
+      autospec=True,
+  )
+  async def test_generate_images_bounds_concurrent_requests(
+      self, mock_generate_image
+  ):
+    self.enter_context(
+        mock.patch.object(
+            generate_images,
+            '_IMAGE_REQUEST_SEMAPHORE',
+            per_loop_semaphore.PerLoopSemaphore(2),
+        )
+    )
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def _generate(**unused_kwargs):
+      nonlocal in_flight, max_in_flight
+      with lock:
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+      time.sleep(0.05)
+      with lock:
+        in_flight -= 1
+      return [(b'image', 'image/png')]
+
+    mock_generate_image.side_effect = _generate
+    self.mock_tool_context.load_artifact = mock.AsyncMock(return_value=None)
+
+    await generate_images.generate_images(
+        prompt='A cool dog',
+        model='flash',
+        aspect_ratio='1:1',
+        tool_context=self.mock_tool_context,
+        num_images=5,
+    )
+
+    self.assertEqual(mock_generate_image.call_count, 5)
+    self.assertLessEqual(max_in_flight, 2)
+
+  async def test_generate_images_invalid_num_images(self):
+    self.mock_tool_context.load_artifact = mock.AsyncMock(return_value=None)
+    with self.assertRaises(opal_adk_error.OpalAdkError) as error_cm:
+      await generate_images.generate_images(
+          prompt='A cool dog',
+          model='flash',
+          aspect_ratio='1:1',
+          tool_context=self.mock_tool_context,
+          num_images=0,
+      )
+    self.assertEqual(error_cm.exception.error_code, code_pb2.INVALID_ARGUMENT)
+
+  @parameterized.named_parameters(
+      ('digit_count', 'Generate 3 images of a cat', True),
+      ('word_count', 'Create five different scenes of a story', True),
+      ('keyframes', 'Make 4 keyframes for a video', True),
+      ('series', 'A series of images of a fox', True),
+      ('plural_without_count', 'Images of three cats', True),
+      ('storyboard', 'A storyboard for a cereal ad', True),
+      ('no_image_noun', 'A cool dog on a skateboard', True),
+      ('single_image', 'An image of a cool dog on a skateboard', False),
+      ('single_count', 'Generate 1 image of a dog', False),
+      ('single_with_subject_count', 'A photo of three cats', False),
+  )
+  @mock.patch.object(
+      gemini_generate_image,
+      'gemini_generate_images',
+      autospec=True,
+  )
+  async def test_generate_images_prefix_unless_single_image(
+      self, prompt, expect_prefix, mock_generate_image
+  ):
+    mock_generate_image.return_value = [(b'image1', 'image/png')]
+    self.mock_tool_context.load_artifact = mock.AsyncMock(return_value=None)
+
+    await generate_images.generate_images(
+        prompt=prompt,
+        model='flash',
+        aspect_ratio='1:1',
+        tool_context=self.mock_tool_context,
+    )
+
+    _, kwargs = mock_generate_image.call_args
+    self.assertEqual(
+        generate_images._AI_IMAGE_TOOL_PREFIX_PART in kwargs['parts'],
+        expect_prefix,
+    )
+    self.assertEqual(kwargs['parts'][-1].text, prompt)
+
+  @mock.patch.object(
+      gemini_generate_image,
+      'gemini_generate_images',
+      autospec=True,
+  )
+  async def test_generate_images_keeps_prefix_with_reference_images(
+      self, mock_generate_image
+  ):
+    mock_generate_image.return_value = [(b'image1', 'image/png')]
+    self.mock_tool_context.load_artifact = mock.AsyncMock(
+        return_value=types.Part.from_bytes(data=b'input1', mime_type='image/png')
+    )
+
+    await generate_images.generate_images(
+        prompt='An image of a cool dog',
+        model='flash',
+        aspect_ratio='1:1',
+        tool_context=self.mock_tool_context,
+    )
+
+    _, kwargs = mock_generate_image.call_args
+    self.assertIs(
+        kwargs['parts'][0], generate_images._AI_IMAGE_TOOL_PREFIX_PART
+    )
+
   async def test_generate_images_invalid_model(self):
+    self.mock_tool_context.load_artifact = mock.AsyncMock(return_value=None)
     with self.assertRaises(opal_adk_error.OpalAdkError) as error_cm:
       await generate_images.generate_images(
           prompt='A cool dog',
@@ -119,6 +330,22 @@ class GenerateImagesTest(absltest.TestCase, unittest.IsolatedAsyncioTestCase):
         'generate_imagesInvalid model name: invalid_model',
         error_cm.exception.status_message,
     )
+    self.mock_tool_context.load_artifact.assert_not_awaited()
+
+  async def test_generate_images_invalid_aspect_ratio(self):
+    self.mock_tool_context.load_artifact = mock.AsyncMock(return_value=None)
+    with self.assertRaises(opal_adk_error.OpalAdkError) as error_cm:
+      await generate_images.generate_images(
+          prompt='A cool dog',
+          model='flash',
+          aspect_ratio='2:1',
+          tool_context=self.mock_tool_context,
+      )
+    self.assertEqual(error_cm.exception.error_code, code_pb2.INVALID_ARGUMENT)
+    self.assertIn(
+        'Invalid aspect ratio: 2:1', error_cm.exception.status_message
+    )
+    self.mock_tool_context.load_artifact.assert_not_awaited()
 
 
 if __name__ == '__main__':
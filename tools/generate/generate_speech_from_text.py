@@ -5,11 +5,14 @@ audio content, utilizing specified voice types. It handles voice mapping
 and error management.
 """
 
+import asyncio
+from collections.abc import AsyncIterator
 import enum
 import logging
 from google.genai import types
 from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools.generate.generate_utils import vertex_generate_audio
+from opal_adk.util import per_loop_semaphore
 from google.rpc import code_pb2
 
 
@@ -27,26 +30,34 @@ _VOICE_MAPPING = {
     VoiceTypes.EN_US_MALE: VoiceNames.CHARON,
     VoiceTypes.EN_US_FEMALE: VoiceNames.ZEPHYR,
 }
+# Maps the raw voice option straight to the TTS voice name, so validating and
+# resolving a voice is a single lookup.
+_VOICE_OPTION_TO_NAME = {
+    voice_type.value: voice_name.value
+    for voice_type, voice_name in _VOICE_MAPPING.items()
+}
+# Upper bound on TTS requests in flight across all callers in this process, so
+# long narrations queue locally rather than exceeding the TTS quota.
+_MAX_CONCURRENT_TTS_REQUESTS = 8
+_TTS_REQUEST_SEMAPHORE = per_loop_semaphore.PerLoopSemaphore(
+    _MAX_CONCURRENT_TTS_REQUESTS
+)
 
 
-def generate_speech_from_text(
-    tts_input: list[str], voice: str = VoiceTypes.EN_US_FEMALE.value
-) -> list[types.Content]:
-  """Generates speech from text.
+def _resolve_voice_name(voice: str) -> str:
+  """Returns the TTS voice name for a voice option.
 
   Args:
-   tts_input: A sequence of texts to turn into speech.
-   voice: The voice to use for speech generation. This must be either
-     'en_US_male' or 'en_US_female'.
+    voice: The voice option, either 'en_US_male' or 'en_US_female'.
 
   Returns:
-    A list of `types.Content`, where each element contains the generated audio
-    for the corresponding input text in `tts_input`.
-  """
+    The name of the prebuilt TTS voice.
 
-  try:
-    voice_type = VoiceTypes(voice)
-  except ValueError:
+  Raises:
+    opal_adk_error.OpalAdkError: If the voice option is not supported.
+  """
+  voice_name = _VOICE_OPTION_TO_NAME.get(voice)
+  if voice_name is None:
     error_text = (
         f'Received invalid voice option, received {voice} but must be one of'
         f' {[v.value for v in VoiceTypes]}.'
@@ -55,28 +66,81 @@ def generate_speech_from_text(
         logged=f'generated_speech_from_text: {error_text}',
         status_message=error_text,
         status_code=code_pb2.INVALID_ARGUMENT,
-    ) from None
+    )
+  return voice_name
+
+
+async def _generate_audio(text: str, voice_name: str) -> tuple[bytes, str]:
+  """Generates audio for one text without blocking the event loop."""
+  async with _TTS_REQUEST_SEMAPHORE:
+    return await asyncio.to_thread(
+        vertex_generate_audio.generate_audio, text, voice_name
+    )
+
+
+async def generate_speech_from_text_stream(
+    tts_input: list[str], voice: str = VoiceTypes.EN_US_FEMALE.value
+) -> AsyncIterator[types.Content]:
+  """Generates speech from text, yielding each clip as soon as it is ready.
+
+  All texts are synthesized concurrently, and clips are yielded in the order
+  of `tts_input`, so the first clip can be consumed while later ones are still
+  being generated.
+
+  Args:
+   tts_input: A sequence of texts to turn into speech.
+   voice: The voice to use for speech generation. This must be either
+     'en_US_male' or 'en_US_female'.
+
+  Yields:
+    A `types.Content` containing the generated audio for each text in
+    `tts_input`.
+  """
+  voice_name = _resolve_voice_name(voice)
 
-  voice_name = _VOICE_MAPPING[voice_type].value
   logging.info('Calling TTS voice %s', voice_name)
+  tasks = [
+      asyncio.create_task(_generate_audio(text, voice_name))
+      for text in tts_input
+  ]
   try:
-    results = []
-    for text in tts_input:
-      audio_bytes, mime_type = (
-          vertex_generate_audio.generate_audio(text, voice_name)
-      )
-      results.append(
-          types.Content(
-              parts=[
-                  types.Part.from_bytes(data=audio_bytes, mime_type=mime_type)
-              ]
-          )
+    for task in tasks:
+      try:
+        audio_bytes, mime_type = await task
+      except Exception as e:  # pylint: disable=broad-exception-caught
+        raise opal_adk_error.OpalAdkError(
+            logged=(
+                f'Error generating audio via TTS: error type: {type(e)}: {e}'
+            ),
+            status_message=opal_adk_error.MODEL_CALL_ERROR_MESSAGE,
+            status_code=code_pb2.INTERNAL,
+        ) from e
+      yield types.Content(
+          parts=[types.Part.from_bytes(data=audio_bytes, mime_type=mime_type)]
       )
-    return results
-  except Exception as e:  # pylint: disable=broad-exception-caught
-    raise opal_adk_error.OpalAdkError(
-        logged=f'Error generating audio via TTS: error type: {type(e)}: {e}',
-        status_message=opal_adk_error.MODEL_CALL_ERROR_MESSAGE,
-        status_code=code_pb2.INTERNAL,
-        internal_details=f'Error generating audio via TTS: {e}',
-    )
+  finally:
+    # Stop waiting on remaining clips if the consumer stops early or a clip
+    # fails.
+    for task in tasks:
+      task.cancel()
+
+
+async def generate_speech_from_text(
+    tts_input: list[str], voice: str = VoiceTypes.EN_US_FEMALE.value
+) -> list[types.Content]:
+  """Generates speech from text.
+
+  Args:
+   tts_input: A sequence of texts to turn into speech.
+   voice: The voice to use for speech generation. This must be either
+     'en_US_male' or 'en_US_female'.
+
+  Returns:
+    A list of `types.Content`, where each element contains the generated audio
+    for the corresponding input text in `tts_input`. All texts are synthesized
+    concurrently.
+  """
+  return [
+      content
+      async for content in generate_speech_from_text_stream(tts_input, voice)
+  ]
@@ -1,5 +1,7 @@
 """Tests for generate_speech_from_text."""
 
+import threading
+import unittest
 from unittest import mock
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -8,7 +10,9 @@ from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools.generate import generate_speech_from_text
 from google.rpc import code_pb2
 
-class GenerateSpeechFromTextTest(parameterized.TestCase):
+class GenerateSpeechFromTextTest(
+    parameterized.TestCase, unittest.IsolatedAsyncioTestCase
+):
 
   @parameterized.named_parameters(
       dict(
@@ -26,13 +30,13 @@ class GenerateSpeechFromTextTest(parameterized.TestCase):
       'opal_adk.tools.generate.generate_utils.vertex_generate_audio.generate_audio',
       autospec=True,
   )
-  def test_generate_speech_from_text_success(
+  async def test_generate_speech_from_text_success(
       self, mock_generate_audio, voice_input, expected_voice_name
   ):
     mock_generate_audio.return_value = (b'audio_bytes', 'audio/wav')
     input_text = ['Hello', 'World']
 
-    result = generate_speech_from_text.generate_speech_from_text(
+    result = await generate_speech_from_text.generate_speech_from_text(
         input_text, voice=voice_input
     )
 
@@ -47,7 +51,7 @@ class GenerateSpeechFromTextTest(parameterized.TestCase):
     mock_generate_audio.assert_any_call('Hello', expected_voice_name)
     mock_generate_audio.assert_any_call('World', expected_voice_name)
 
-  def test_generate_speech_from_text_default_voice(self):
+  async def test_generate_speech_from_text_default_voice(self):
     with mock.patch(
         'opal_adk.tools.generate.generate_utils.vertex_generate_audio.generate_audio',
         autospec=True,
@@ -55,14 +59,16 @@ class GenerateSpeechFromTextTest(parameterized.TestCase):
       mock_generate_audio.return_value = (b'bytes', 'audio/mp3')
       input_text = ['Test']
 
-      result = generate_speech_from_text.generate_speech_from_text(input_text)
+      result = await generate_speech_from_text.generate_speech_from_text(
+          input_text
+      )
 
       self.assertLen(result, 1)
       mock_generate_audio.assert_called_once_with('Test', 'Zephyr')
 
-  def test_generate_speech_from_text_invalid_voice(self):
+  async def test_generate_speech_from_text_invalid_voice(self):
     with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
-      generate_speech_from_text.generate_speech_from_text(
+      await generate_speech_from_text.generate_speech_from_text(
           ['Test'], voice='invalid_voice'
       )
 
@@ -73,18 +79,70 @@ class GenerateSpeechFromTextTest(parameterized.TestCase):
       'opal_adk.tools.generate.generate_utils.vertex_generate_audio.generate_audio',
       autospec=True,
   )
-  def test_generate_speech_from_text_internal_error(self, mock_generate_audio):
+  async def test_generate_speech_from_text_internal_error(
+      self, mock_generate_audio
+  ):
     mock_generate_audio.side_effect = Exception('Something went wrong')
 
     with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
-      generate_speech_from_text.generate_speech_from_text(['Test'])
+      await generate_speech_from_text.generate_speech_from_text(['Test'])
 
     self.assertEqual(cm.exception.error_code, code_pb2.INTERNAL)
     self.assertEqual(
         cm.exception.status_message,
         opal_adk_error.MODEL_CALL_ERROR_MESSAGE,
     )
-    self.assertIn('Something went wrong', cm.exception.internal_details)
+    self.assertIn('Something went wrong', str(cm.exception))
+    self.assertEqual(str(cm.exception.__cause__), 'Something went wrong')
+
+  @mock.patch(
+      'opal_adk.tools.generate.generate_utils.vertex_generate_audio.generate_audio',
+      autospec=True,
+  )
+  async def test_generate_speech_from_text_preserves_input_order(
+      self, mock_generate_audio
+  ):
+    mock_generate_audio.side_effect = lambda text, voice_name: (
+        text.encode(),
+        'audio/wav',
+    )
+
+    result = await generate_speech_from_text.generate_speech_from_text(
+        ['one', 'two', 'three']
+    )
+
+    self.assertEqual(
+        [content.parts[0].inline_data.data for content in result],
+        [b'one', b'two', b'three'],
+    )
+
+  @mock.patch(
+      'opal_adk.tools.generate.generate_utils.vertex_generate_audio.generate_audio',
+      autospec=True,
+  )
+  async def test_generate_speech_from_text_stream_yields_before_all_done(
+      self, mock_generate_audio
+  ):
+    first_clip_consumed = threading.Event()
+
+    def _generate_audio(text, voice_name):
+      del voice_name  # Unused.
+      if text == 'second':
+        first_clip_consumed.wait(timeout=5)
+      return text.encode(), 'audio/wav'
+
+    mock_generate_audio.side_effect = _generate_audio
+
+    clips = []
+    async for content in (
+        generate_speech_from_text.generate_speech_from_text_stream(
+            ['first', 'second']
+        )
+    ):
+      clips.append(content.parts[0].inline_data.data)
+      first_clip_consumed.set()
+
+    self.assertEqual(clips, [b'first', b'second'])
 
 
 if __name__ == '__main__':
@@ -1,7 +1,9 @@
 """Tool for generating text with grounding support."""
 
+import functools
 import logging
 from typing import Any
+from google import genai
 from google.genai import types
 from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
@@ -10,12 +12,81 @@ from opal_adk.tools import map_search_tool
 from opal_adk.tools import vertex_search_tool
 from opal_adk.types import models
 from opal_adk.types import output_type
+from opal_adk.util import per_loop_semaphore
+from opal_adk.util import retry_util
 from google.rpc import code_pb2
 
 _GENERATE_TEXT_INSTRUCTIONS = """You are working as part of an AI system, so
 no chit-chat and no explaining what you're doing and why. DO NOT start with 
 "Okay", or "Alright" or any preambles. Just the output, please."""
 _USER_ROLE = "user"
+# The system instruction never changes, so it is built once at import. The
+# config for the common no-tools case is shared the same way.
+_SYSTEM_INSTRUCTIONS = types.Content(
+    parts=[types.Part(text=_GENERATE_TEXT_INSTRUCTIONS)], role=_USER_ROLE
+)
+_NO_TOOLS_CONFIG = types.GenerateContentConfig(
+    system_instruction=_SYSTEM_INSTRUCTIONS,
+    tools=[],
+)
+
+# Upper bound on generate_content calls in flight across all generate_text
+# calls in this process, so bursts queue locally instead of hitting 429s.
+_MAX_CONCURRENT_TEXT_REQUESTS = 16
+_TEXT_REQUEST_SEMAPHORE = per_loop_semaphore.PerLoopSemaphore(
+    _MAX_CONCURRENT_TEXT_REQUESTS
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_content_config(
+    search_grounding: bool, maps_grounding: bool, url_context: bool
+) -> types.GenerateContentConfig:
+  """Returns the shared config for a combination of grounding options.
+
+  The config depends only on these three flags, so each of the eight
+  combinations is built once, along with its tool instances, and reused.
+
+  Args:
+    search_grounding: Whether to attach the Google Search agent tool.
+    maps_grounding: Whether to attach the Google Maps search tool.
+    url_context: Whether to attach the URL contents tool.
+
+  Returns:
+    The GenerateContentConfig to send with the request.
+  """
+  filtered_tools = []
+  if search_grounding:
+    filtered_tools.append(vertex_search_tool.search_agent_tool())
+  if maps_grounding:
+    filtered_tools.append(map_search_tool.MapSearchTool())
+  if url_context:
+    filtered_tools.append(fetch_url_contents_tool.FetchUrlContentsTool())
+  if not filtered_tools:
+    return _NO_TOOLS_CONFIG
+  return types.GenerateContentConfig(
+      system_instruction=_SYSTEM_INSTRUCTIONS,
+      tools=filtered_tools,
+  )
+
+
+async def _generate_content(
+    vertex_client: genai.Client, **kwargs: Any
+) -> types.GenerateContentResponse:
+  """Sends one generate_content request while holding a concurrency slot.
+
+  The slot is taken per attempt, so a throttled call releases it while it
+  backs off instead of keeping other requests waiting.
+
+  Args:
+    vertex_client: The client to send the request with.
+    **kwargs: Keyword arguments passed to generate_content.
+
+  Returns:
+    The model response.
+  """
+  async with _TEXT_REQUEST_SEMAPHORE:
+    return await vertex_client.aio.models.generate_content(**kwargs)
 
 
 async def generate_text(
@@ -98,27 +169,18 @@ async def generate_text(
     )
 
   logging.info("generate_text: output_format: %s", output_format_enum)
-  filtered_tools = []
-  if search_grounding:
-    filtered_tools.append(vertex_search_tool.search_agent_tool())
-  if maps_grounding:
-    filtered_tools.append(map_search_tool.MapSearchTool())
-  if url_context:
-    filtered_tools.append(fetch_url_contents_tool.FetchUrlContentsTool())
-  vertex_client = vertex_ai_client.create_vertex_ai_client()
-  system_instructions = types.Content(
-      parts=[types.Part(text=_GENERATE_TEXT_INSTRUCTIONS)], role=_USER_ROLE
-  )
+  vertex_client = vertex_ai_client.get_vertex_ai_client()
   content = types.Content(
       parts=[types.Part(text=instructions)], role=_USER_ROLE
   )
-  content_config = types.GenerateContentConfig(
-      system_instruction=system_instructions,
-      tools=filtered_tools,
+  content_config = _get_content_config(
+      search_grounding, maps_grounding, url_context
   )
 
   model_id = models.simple_model_to_model(model_enum).value
-  return await vertex_client.aio.models.generate_content(
+  return await retry_util.call_with_backoff_async(
+      _generate_content,
+      vertex_client,
       model=model_id,
       contents=content,
       config=content_config,
@@ -1,10 +1,12 @@
 """Tests for generate_text."""
 
+import asyncio
 import unittest
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
+from google.genai import errors as genai_errors
 from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools import fetch_url_contents_tool
@@ -13,6 +15,8 @@ from opal_adk.tools import vertex_search_tool
 from opal_adk.tools.generate import generate_text
 from opal_adk.types import models
 from opal_adk.types import output_type
+from opal_adk.util import per_loop_semaphore
+from opal_adk.util import retry_util
 
 
 class GenerateTextTest(
@@ -21,46 +25,35 @@ class GenerateTextTest(
 
   def setUp(self):
     super().setUp()
-    # Patcher for vertex_search_tool.search_agent_tool
-    self.search_tool_patcher = mock.patch.object(
-        vertex_search_tool, 'search_agent_tool'
+    vertex_ai_client.get_vertex_ai_client.cache_clear()
+    self.addCleanup(vertex_ai_client.get_vertex_ai_client.cache_clear)
+    # The config cache holds tool instances, which are mocked per test.
+    generate_text._get_content_config.cache_clear()
+    self.addCleanup(generate_text._get_content_config.cache_clear)
+
+    self.mock_search_tool = self.enter_context(
+        mock.patch.object(vertex_search_tool, 'search_agent_tool')
     )
-    self.mock_search_tool = self.search_tool_patcher.start()
-
-    # Patcher for map_search_tool.MapSearchTool
-    self.map_tool_patcher = mock.patch.object(map_search_tool, 'MapSearchTool')
-    self.mock_map_tool = self.map_tool_patcher.start()
-
-    # Patcher for fetch_url_contents_tool.FetchUrlContentsTool
-    self.fetch_url_tool_patcher = mock.patch.object(
-        fetch_url_contents_tool, 'FetchUrlContentsTool'
+    self.mock_map_tool = self.enter_context(
+        mock.patch.object(map_search_tool, 'MapSearchTool')
     )
-    self.mock_fetch_url_tool = self.fetch_url_tool_patcher.start()
-
-    # Patcher for models.simple_model_to_model
-    self.model_converter_patcher = mock.patch.object(
-        models, 'simple_model_to_model', autospec=True
+    self.mock_fetch_url_tool = self.enter_context(
+        mock.patch.object(fetch_url_contents_tool, 'FetchUrlContentsTool')
+    )
+    self.mock_model_converter = self.enter_context(
+        mock.patch.object(models, 'simple_model_to_model', autospec=True)
     )
-    self.mock_model_converter = self.model_converter_patcher.start()
     # Mock the return value of simple_model_to_model to have a .value attribute
     self.mock_model_converter.return_value.value = 'mock-model-value'
-
-    # Patcher for vertex_ai_client.create_vertex_ai_client
-    self.client_patcher = mock.patch.object(
-        vertex_ai_client, 'create_vertex_ai_client', autospec=True
+    self.mock_create_client = self.enter_context(
+        mock.patch.object(
+            vertex_ai_client, 'create_vertex_ai_client', autospec=True
+        )
     )
-    self.mock_create_client = self.client_patcher.start()
     self.mock_client = self.mock_create_client.return_value
     # Mock aio.models.generate_content
-    self.mock_client.aio.models.generate_content = mock.AsyncMock()
-
-  def tearDown(self):
-    self.search_tool_patcher.stop()
-    self.map_tool_patcher.stop()
-    self.fetch_url_tool_patcher.stop()
-    self.model_converter_patcher.stop()
-    self.client_patcher.stop()
-    super().tearDown()
+    self.mock_generate_content = mock.AsyncMock()
+    self.mock_client.aio.models.generate_content = self.mock_generate_content
 
   async def test_generate_text_default_args(self):
     instructions = 'Test instructions'
@@ -87,11 +80,52 @@ class GenerateTextTest(
     self.assertEqual(config.tools, [])
     self.assertEqual(config.system_instruction.role, 'user')
     self.assertIn('no chit-chat', config.system_instruction.parts[0].text)
+    self.assertIs(config, generate_text._NO_TOOLS_CONFIG)
 
     self.assertEqual(
         response, self.mock_client.aio.models.generate_content.return_value
     )
 
+  async def test_generate_text_reuses_client(self):
+    await generate_text.generate_text('First instructions')
+    await generate_text.generate_text('Second instructions')
+
+    self.mock_create_client.assert_called_once_with(
+        use_vertex=False, http_options=vertex_ai_client._POOLED_HTTP_OPTIONS
+    )
+    self.assertEqual(
+        self.mock_client.aio.models.generate_content.await_count, 2
+    )
+
+  async def test_generate_text_releases_slot_while_backing_off(self):
+    self.enter_context(
+        mock.patch.object(
+            generate_text,
+            '_TEXT_REQUEST_SEMAPHORE',
+            per_loop_semaphore.PerLoopSemaphore(1),
+        )
+    )
+    self.mock_generate_content.side_effect = [
+        genai_errors.ClientError(429, {'error': {'message': 'error'}}),
+        'response',
+    ]
+
+    async def _sleep(unused_delay):
+      # Deadlocks, and so times out, if the throttled call still holds the
+      # only slot.
+      async with generate_text._TEXT_REQUEST_SEMAPHORE:
+        pass
+
+    with mock.patch.object(
+        retry_util.asyncio, 'sleep', autospec=True, side_effect=_sleep
+    ):
+      response = await asyncio.wait_for(
+          generate_text.generate_text('instructions'), timeout=5
+      )
+
+    self.assertEqual(response, 'response')
+    self.assertEqual(self.mock_generate_content.await_count, 2)
+
   @parameterized.named_parameters(
       dict(
           testcase_name='invalid_model',
@@ -143,6 +177,19 @@ class GenerateTextTest(
     _, call_kwargs = self.mock_client.aio.models.generate_content.call_args
     config = call_kwargs['config']
     self.assertIn(expected_tool, config.tools)
+    # The tool instance, not the factory or class, must be attached.
+    self.assertNotIn(mock_tool, config.tools)
+    self.assertIs(config.system_instruction, generate_text._SYSTEM_INSTRUCTIONS)
+
+  async def test_generate_text_reuses_tools_and_config(self):
+    await generate_text.generate_text('first', maps_grounding=True)
+    await generate_text.generate_text('second', maps_grounding=True)
+
+    self.mock_map_tool.assert_called_once()
+    (_, first_kwargs), (_, second_kwargs) = (
+        self.mock_client.aio.models.generate_content.call_args_list
+    )
+    self.assertIs(first_kwargs['config'], second_kwargs['config'])
 
   async def test_generate_text_all_options(self):
     await generate_text.generate_text(
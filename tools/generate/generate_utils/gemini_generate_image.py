@@ -1,5 +1,6 @@
 """Utility function to edit/generate image via Gemini API."""
 
+import asyncio
 import logging
 
 from google.genai import types
@@ -9,9 +10,77 @@ from opal_adk.types import image_types
 from opal_adk.types import models
 from opal_adk.util import gemini_utils
 from opal_adk.util import llm_logging
+from opal_adk.util import retry_util
 
 from google.rpc import code_pb2
 
+_RESPONSE_MODALITIES = ('TEXT', 'IMAGE')
+
+
+def _build_config(
+    aspect_ratio: image_types.AspectRatio,
+    safety_settings: list[types.SafetySetting] | None,
+) -> types.GenerateContentConfig:
+  """Returns the image generation request config."""
+  return types.GenerateContentConfig(
+      response_modalities=_RESPONSE_MODALITIES,
+      safety_settings=safety_settings,
+      image_config=types.ImageConfig(
+          aspect_ratio=aspect_ratio.value,
+      ),
+  )
+
+
+def _parse_response(
+    response: types.GenerateContentResponse,
+) -> list[tuple[bytes, str]]:
+  """Extracts the generated images from a Gemini response.
+
+  Args:
+    response: The response returned by generate_content.
+
+  Returns:
+    List of tuples (image_bytes, mime_type) for each generated image.
+
+  Raises:
+    opal_adk_error.OpalAdkError: If the response contains no images.
+  """
+  if not response.candidates:
+    raise opal_adk_error.OpalAdkError(
+        status_message='No candidates returned from Gemini API.',
+        status_code=code_pb2.INTERNAL,
+    )
+
+  logging.info('gemini_generate_image: Returned images: %s', response)
+  content = response.candidates[0].content
+  if not content or not content.parts:
+    raise opal_adk_error.OpalAdkError(
+        status_message='No content parts returned from Gemini API.',
+        status_code=code_pb2.INTERNAL,
+    )
+
+  gemini_utils.validate_candidate_recitation(response)
+  image_parts = []
+  for part in content.parts:
+    inline_data = part.inline_data
+    if inline_data is not None:
+      image_parts.append((inline_data.data, inline_data.mime_type))
+
+  if not image_parts:
+    message = 'No images generated.'
+    details = ''
+    # Text is only surfaced when no image came back, so collect it lazily.
+    text_parts = [part.text for part in content.parts if part.text]
+    if text_parts:
+      details = 'Gemini returned the following text instead of image(s): '
+      details += ' '.join(text_parts)
+    raise opal_adk_error.OpalAdkError(
+        status_message=message,
+        status_code=code_pb2.INTERNAL,
+        details=details,
+    )
+  return image_parts
+
 
 def gemini_generate_images(
     parts: list[types.Part],
@@ -40,15 +109,9 @@ def gemini_generate_images(
       'gemini_generate_image: calling generate image with model: %s', model_name
   )
 
-  config = types.GenerateContentConfig(
-      response_modalities=['TEXT', 'IMAGE'],
-      safety_settings=safety_settings,
-      image_config=types.ImageConfig(
-          aspect_ratio=aspect_ratio.value,
-      ),
-  )
+  config = _build_config(aspect_ratio, safety_settings)
 
-  client = vertex_ai_client.create_vertex_ai_client(use_vertex=False)
+  client = vertex_ai_client.get_vertex_ai_client(use_vertex=False)
 
   try:
     logging.info(
@@ -56,7 +119,8 @@ def gemini_generate_images(
         config,
     )
     logging.info("gemini_generate_image: Calling generate image with: %s", parts)
-    response = client.models.generate_content(
+    response = retry_util.call_with_backoff(
+        client.models.generate_content,
         model=model_name,
         contents=types.Content(parts=parts, role='user'),
         config=config,
@@ -66,44 +130,57 @@ def gemini_generate_images(
     llm_logging.log_operation_end('Generate Image (Gemini)', success=False)
     raise opal_adk_error.get_opal_adk_error(e) from e
 
-  if not response.candidates:
+  try:
+    image_parts = _parse_response(response)
+  except opal_adk_error.OpalAdkError:
     llm_logging.log_operation_end('Generate Image (Gemini)', success=False)
-    raise opal_adk_error.OpalAdkError(
-        status_message='No candidates returned from Gemini API.',
-        status_code=code_pb2.INTERNAL,
-    )
+    raise
 
-  logging.info('gemini_generate_image: Returned images: %s', response)
-  content = response.candidates[0].content
-  if not content or not content.parts:
-    llm_logging.log_operation_end('Generate Image (Gemini)', success=False)
-    raise opal_adk_error.OpalAdkError(
-        status_message='No content parts returned from Gemini API.',
-        status_code=code_pb2.INTERNAL,
-    )
+  llm_logging.log_operation_end('Generate Image (Gemini)', success=True)
+  return image_parts
 
-  gemini_utils.validate_candidate_recitation(response)
-  image_parts = []
-  text_parts = []
-  for part in content.parts:
-    if part.inline_data is not None:
-      image_parts.append((part.inline_data.data, part.inline_data.mime_type))
-    if part.text:
-      text_parts.append(part.text)
 
-  if not image_parts:
-    message = 'No images generated.'
-    details = ''
-    if text_parts:
-      details = 'Gemini returned the following text instead of image(s): '
-      details += ' '.join(text_parts)
-    llm_logging.log_operation_end('Generate Image (Gemini)', success=False)
-    raise opal_adk_error.OpalAdkError(
-        status_message=message,
-        status_code=code_pb2.INTERNAL,
-        details=details,
-        internal_details='gemini_generate_image: ' + details,
-    )
+async def gemini_generate_images_batch(
+    prompts: list[list[types.Part]],
+    aspect_ratio: image_types.AspectRatio = image_types.AspectRatio.RATIO_1_1,
+    model_name: str | None = None,
+    safety_settings: list[types.SafetySetting] | None = None,
+) -> list[list[tuple[bytes, str]]]:
+  """Edits/Generates images for several prompts concurrently with Gemini API.
 
-  llm_logging.log_operation_end('Generate Image (Gemini)', success=True)
-  return image_parts
+  Each prompt is sent as its own request through the async client, so the
+  requests overlap instead of paying one round trip after another.
+
+  Args:
+    prompts: One list of genai Parts (text and/or inline_data) per request.
+    aspect_ratio: The aspect ratio of the generated images.
+    model_name: The Gemini model to use. Defaults to GEMINI_2_5_IMAGE.
+    safety_settings: Optional safety settings.
+
+  Returns:
+    For each prompt, in order, the list of tuples (image_bytes, mime_type) for
+    each generated image.
+
+  Raises:
+    opal_adk_error.OpalAdkError: If unable to generate images for any prompt.
+  """
+  if model_name is None:
+    model_name = models.Models.GEMINI_2_5_FLASH_IMAGE.value
+  config = _build_config(aspect_ratio, safety_settings)
+  client = vertex_ai_client.get_vertex_ai_client(use_vertex=False)
+
+  async def _generate(parts: list[types.Part]) -> list[tuple[bytes, str]]:
+    try:
+      response = await retry_util.call_with_backoff_async(
+          client.aio.models.generate_content,
+          model=model_name,
+          contents=types.Content(parts=parts, role='user'),
+          config=config,
+      )
+    except Exception as e:
+      logging.warning('gemini_generate_image: Unable to generate image: %s.', e)
+      raise opal_adk_error.get_opal_adk_error(e) from e
+    return _parse_response(response)
+
+  with llm_logging.log_operation('Generate Images Batch (Gemini)'):
+    return list(await asyncio.gather(*(_generate(parts) for parts in prompts)))
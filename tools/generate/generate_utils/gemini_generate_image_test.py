@@ -1,58 +1,96 @@
 """Tests for generate_image_via_gemini_api."""
 
+import types as python_types
+import unittest
 from unittest import mock
 
 from absl.testing import absltest
+from absl.testing import parameterized
 from google.genai import types
+from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools.generate.generate_utils import gemini_generate_image
 from opal_adk.types import image_types
 from opal_adk.types import models
 
 
-class GeminiGenerateImageTest(absltest.TestCase):
+def _response(
+    *parts: python_types.SimpleNamespace,
+) -> python_types.SimpleNamespace:
+  """Returns a plain stand-in for a single-candidate GenerateContentResponse."""
+  return python_types.SimpleNamespace(
+      candidates=[
+          python_types.SimpleNamespace(
+              content=python_types.SimpleNamespace(parts=list(parts)),
+              finish_reason=types.FinishReason.STOP,
+          )
+      ]
+  )
+
 
-  @mock.patch.object(
-      gemini_generate_image.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
+def _image_part(data: bytes, mime_type: str) -> python_types.SimpleNamespace:
+  return python_types.SimpleNamespace(
+      inline_data=python_types.SimpleNamespace(data=data, mime_type=mime_type),
+      text=None,
   )
-  def test_generate_image_success(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
 
-    mock_response = mock.Mock()
-    mock_candidate = mock.Mock()
-    mock_content = mock.Mock()
 
-    mock_image_part = mock.Mock()
-    mock_image_part.inline_data = mock.Mock()
-    mock_image_part.inline_data.data = b'fake_image_bytes'
-    mock_image_part.inline_data.mime_type = 'image/png'
-    mock_image_part.text = None
+def _text_part(text: str) -> python_types.SimpleNamespace:
+  return python_types.SimpleNamespace(inline_data=None, text=text)
 
-    mock_text_part = mock.Mock()
-    mock_text_part.inline_data = None
-    mock_text_part.text = 'Some extra text'
 
-    mock_content.parts = [mock_image_part, mock_text_part]
-    mock_candidate.content = mock_content
-    mock_response.candidates = [mock_candidate]
+# The code under test only reads these, so they are shared across tests.
+_IMAGE_BYTES = b'fake_image_bytes'
+_IMAGE_PART = _image_part(_IMAGE_BYTES, 'image/png')
+_IMAGE_RESPONSE = _response(_IMAGE_PART)
+_PROMPT_PARTS = [types.Part(text='A test image')]
+_SAFETY_SETTINGS = [
+    types.SafetySetting(
+        category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+        threshold=types.HarmBlockThreshold.BLOCK_LOW_AND_ABOVE,
+    )
+]
+
 
-    mock_client.models.generate_content.return_value = mock_response
+class GeminiGenerateImageTest(parameterized.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    # Patch the client factory once for the class; tests only need a fresh
+    # client mock each. An autospecced function would bind as a method when
+    # read through self, so a plain mock is used.
+    cls._client_patcher = mock.patch.object(
+        vertex_ai_client, 'create_vertex_ai_client'
+    )
+    cls.mock_create_client = cls._client_patcher.start()
+    cls.addClassCleanup(cls._client_patcher.stop)
+
+  def setUp(self):
+    super().setUp()
+    # The util reuses a cached client, so drop it to pick up this test's mock.
+    vertex_ai_client.get_vertex_ai_client.cache_clear()
+    self.addCleanup(vertex_ai_client.get_vertex_ai_client.cache_clear)
+    self.mock_create_client.reset_mock(return_value=True, side_effect=True)
+    self.mock_client = mock.Mock()
+    self.mock_create_client.return_value = self.mock_client
+
+  def test_generate_image_success(self):
+    self.mock_client.models.generate_content.return_value = _response(
+        _IMAGE_PART, _text_part('Some extra text')
+    )
 
-    parts = [types.Part(text='A test image')]
     images = gemini_generate_image.gemini_generate_images(
-        parts,
+        _PROMPT_PARTS,
         aspect_ratio=image_types.AspectRatio.RATIO_16_9,
     )
 
     self.assertLen(images, 1)
-    self.assertEqual(images[0][0], b'fake_image_bytes')
+    self.assertEqual(images[0][0], _IMAGE_BYTES)
     self.assertEqual(images[0][1], 'image/png')
 
-    mock_client.models.generate_content.assert_called_once()
-    _, kwargs = mock_client.models.generate_content.call_args
+    self.mock_client.models.generate_content.assert_called_once()
+    _, kwargs = self.mock_client.models.generate_content.call_args
     self.assertEqual(
         kwargs['model'], models.Models.GEMINI_2_5_FLASH_IMAGE.value
     )
@@ -62,142 +100,107 @@ class GeminiGenerateImageTest(absltest.TestCase):
     self.assertEqual(config.response_modalities, ['TEXT', 'IMAGE'])
     self.assertEqual(config.image_config.aspect_ratio, '16:9')
 
-  @mock.patch.object(
-      gemini_generate_image.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
+  @parameterized.named_parameters(
+      (
+          'no_candidates',
+          python_types.SimpleNamespace(candidates=[]),
+          'No candidates returned',
+      ),
+      ('no_content_parts', _response(), 'No content parts returned'),
+      (
+          'text_only_response',
+          _response(_text_part('I cannot generate an image.')),
+          'No images generated.',
+      ),
   )
-  def test_generate_image_no_candidates(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
-
-    mock_response = mock.Mock()
-    mock_response.candidates = []
-
-    mock_client.models.generate_content.return_value = mock_response
-
-    parts = [types.Part(text='A test image')]
-    with self.assertRaisesRegex(
-        opal_adk_error.OpalAdkError, 'No candidates returned'
-    ):
-      gemini_generate_image.gemini_generate_images(parts)
+  def test_generate_image_invalid_response(self, response, error_regex):
+    self.mock_client.models.generate_content.return_value = response
 
-  @mock.patch.object(
-      gemini_generate_image.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
-  )
-  def test_generate_image_api_error(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
+    with self.assertRaisesRegex(opal_adk_error.OpalAdkError, error_regex):
+      gemini_generate_image.gemini_generate_images(_PROMPT_PARTS)
 
-    mock_client.models.generate_content.side_effect = Exception('API failed')
+  def test_generate_image_api_error(self):
+    self.mock_client.models.generate_content.side_effect = Exception(
+        'API failed'
+    )
 
-    parts = [types.Part(text='A test image')]
     with self.assertRaisesRegex(opal_adk_error.OpalAdkError, 'API failed'):
-      gemini_generate_image.gemini_generate_images(parts)
+      gemini_generate_image.gemini_generate_images(_PROMPT_PARTS)
 
-  @mock.patch.object(
-      gemini_generate_image.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
-  )
-  def test_generate_image_text_only_response(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
+  def test_generate_image_with_optional_params(self):
+    self.mock_client.models.generate_content.return_value = _IMAGE_RESPONSE
 
-    mock_response = mock.Mock()
-    mock_candidate = mock.Mock()
-    mock_content = mock.Mock()
+    images = gemini_generate_image.gemini_generate_images(
+        _PROMPT_PARTS,
+        aspect_ratio=image_types.AspectRatio.RATIO_4_3,
+        model_name='custom_model',
+        safety_settings=_SAFETY_SETTINGS,
+    )
 
-    mock_text_part = mock.Mock()
-    mock_text_part.inline_data = None
-    mock_text_part.text = 'I cannot generate an image.'
+    self.assertLen(images, 1)
 
-    mock_content.parts = [mock_text_part]
-    mock_candidate.content = mock_content
-    mock_response.candidates = [mock_candidate]
+    self.mock_client.models.generate_content.assert_called_once()
+    _, kwargs = self.mock_client.models.generate_content.call_args
+    self.assertEqual(kwargs['model'], 'custom_model')
+    config = kwargs['config']
+    self.assertEqual(config.safety_settings, _SAFETY_SETTINGS)
+    self.assertEqual(config.image_config.aspect_ratio, '4:3')
 
-    mock_client.models.generate_content.return_value = mock_response
 
-    parts = [types.Part(text='A test image')]
-    with self.assertRaisesRegex(
-        opal_adk_error.OpalAdkError, 'No images generated.'
-    ):
-      gemini_generate_image.gemini_generate_images(parts)
+class GeminiGenerateImagesBatchTest(
+    absltest.TestCase, unittest.IsolatedAsyncioTestCase
+):
 
-  @mock.patch.object(
-      gemini_generate_image.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
-  )
-  def test_generate_image_no_content_parts(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
-
-    mock_response = mock.Mock()
-    mock_candidate = mock.Mock()
-    mock_content = mock.Mock()
+  def setUp(self):
+    super().setUp()
+    vertex_ai_client.get_vertex_ai_client.cache_clear()
+    self.addCleanup(vertex_ai_client.get_vertex_ai_client.cache_clear)
+    self.mock_create_client = self.enter_context(
+        mock.patch.object(
+            vertex_ai_client, 'create_vertex_ai_client', autospec=True
+        )
+    )
+    self.mock_generate_content = mock.AsyncMock()
+    self.mock_create_client.return_value.aio.models.generate_content = (
+        self.mock_generate_content
+    )
 
-    mock_content.parts = []
-    mock_candidate.content = mock_content
-    mock_response.candidates = [mock_candidate]
+  async def test_generate_images_batch_returns_images_per_prompt(self):
+    second_bytes = b'second_image_bytes'
+    self.mock_generate_content.side_effect = [
+        _IMAGE_RESPONSE,
+        _response(_image_part(second_bytes, 'image/jpeg')),
+    ]
+    second_prompt = [types.Part(text='Another test image')]
+
+    results = await gemini_generate_image.gemini_generate_images_batch(
+        [_PROMPT_PARTS, second_prompt],
+        aspect_ratio=image_types.AspectRatio.RATIO_9_16,
+    )
 
-    mock_client.models.generate_content.return_value = mock_response
+    self.assertEqual(
+        results,
+        [[(_IMAGE_BYTES, 'image/png')], [(second_bytes, 'image/jpeg')]],
+    )
+    self.assertEqual(self.mock_generate_content.await_count, 2)
+    self.mock_create_client.assert_called_once()
+    configs = [
+        kwargs['config']
+        for _, kwargs in self.mock_generate_content.await_args_list
+    ]
+    self.assertIs(configs[0], configs[1])
+    self.assertEqual(configs[0].image_config.aspect_ratio, '9:16')
+
+  async def test_generate_images_batch_raises_on_invalid_response(self):
+    self.mock_generate_content.return_value = _response()
 
-    parts = [types.Part(text='A test image')]
     with self.assertRaisesRegex(
         opal_adk_error.OpalAdkError, 'No content parts returned'
     ):
-      gemini_generate_image.gemini_generate_images(parts)
+      await gemini_generate_image.gemini_generate_images_batch(
+          [_PROMPT_PARTS]
+      )
 
 
 if __name__ == '__main__':
   absltest.main()
-
-  @mock.patch.object(
-      gemini_generate_image.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
-  )
-  def test_generate_image_with_optional_params(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
-
-    mock_response = mock.Mock()
-    mock_candidate = mock.Mock()
-    mock_content = mock.Mock()
-
-    mock_image_part = mock.Mock()
-    mock_image_part.inline_data = mock.Mock()
-    mock_image_part.inline_data.data = b'fake_image_bytes'
-    mock_image_part.inline_data.mime_type = 'image/png'
-    mock_image_part.text = None
-
-    mock_content.parts = [mock_image_part]
-    mock_candidate.content = mock_content
-    mock_response.candidates = [mock_candidate]
-
-    mock_client.models.generate_content.return_value = mock_response
-
-    parts = [types.Part(text='A test image')]
-    safety_settings = [types.SafetySetting(
-        category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-        threshold=types.HarmBlockThreshold.BLOCK_LOW_AND_ABOVE,
-    )]
-    
-    images = gemini_generate_image.gemini_generate_images(
-        parts,
-        aspect_ratio=image_types.AspectRatio.RATIO_4_3.value,
-        model_name='custom_model',
-        safety_settings=safety_settings,
-    )
-
-    self.assertLen(images, 1)
-
-    mock_client.models.generate_content.assert_called_once()
-    _, kwargs = mock_client.models.generate_content.call_args
-    self.assertEqual(kwargs['model'], 'custom_model')
-    config = kwargs['config']
-    self.assertEqual(config.safety_settings, safety_settings)
-    self.assertEqual(config.image_config.aspect_ratio, '4:3')
@@ -1,17 +1,73 @@
 """Utility function to generate audio using Gemini TTS API."""
 
-import io
 import logging
-import wave
+import struct
 
 from google.genai import types
 from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
 from opal_adk.types import models
 from opal_adk.util import llm_logging
+from opal_adk.util import retry_util
 
 from google.rpc import code_pb2
 
+_MAX_TTS_TEXT_CHARS = 1000
+_RESPONSE_MODALITIES = ('AUDIO',)
+# GenerateContentConfig depends only on the voice, so each voice's config is
+# built once and reused.
+_SPEECH_CONFIGS: dict[str, types.GenerateContentConfig] = {}
+
+# The TTS model returns raw 16-bit mono PCM at 24 kHz.
+_NUM_CHANNELS = 1
+_SAMPLE_WIDTH_BYTES = 2
+_SAMPLE_RATE_HZ = 24000
+_WAV_HEADER_SIZE_BYTES = 44
+# RIFF/WAVE header for that fixed format. The RIFF chunk size (offset 4) and
+# data chunk size (offset 40) are filled in per clip.
+_WAV_HEADER_TEMPLATE = (
+    b'RIFF'
+    + struct.pack('<I', 0)
+    + b'WAVEfmt '
+    + struct.pack(
+        '<IHHIIHH',
+        16,
+        1,  # PCM
+        _NUM_CHANNELS,
+        _SAMPLE_RATE_HZ,
+        _SAMPLE_RATE_HZ * _NUM_CHANNELS * _SAMPLE_WIDTH_BYTES,
+        _NUM_CHANNELS * _SAMPLE_WIDTH_BYTES,
+        _SAMPLE_WIDTH_BYTES * 8,
+    )
+    + b'data'
+    + struct.pack('<I', 0)
+)
+
+
+def _pcm_to_wav(pcm_data: bytes) -> bytes:
+  """Wraps raw PCM from the TTS model in a WAV container."""
+  header = bytearray(_WAV_HEADER_TEMPLATE)
+  struct.pack_into('<I', header, 4, _WAV_HEADER_SIZE_BYTES - 8 + len(pcm_data))
+  struct.pack_into('<I', header, 40, len(pcm_data))
+  return bytes(header) + pcm_data
+
+
+def _get_speech_config(voice_name: str) -> types.GenerateContentConfig:
+  """Returns the shared TTS request config for a voice."""
+  config = _SPEECH_CONFIGS.get(voice_name)
+  if config is None:
+    config = _SPEECH_CONFIGS[voice_name] = types.GenerateContentConfig(
+        response_modalities=_RESPONSE_MODALITIES,
+        speech_config=types.SpeechConfig(
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                    voice_name=voice_name
+                )
+            )
+        ),
+    )
+  return config
+
 
 def generate_audio(
     text: str,
@@ -27,61 +83,50 @@ def generate_audio(
     Tuple of (audio_bytes, mime_type).
   """
   llm_logging.log_operation_start('Generate Audio (TTS)')
-  logging.info('TTS text (truncated): %s', text[:1000])
-  gemini_client = vertex_ai_client.create_vertex_ai_client()
-
-  # Truncate to 1000 chars to avoid TTS API limits
-  text = text[:1000]
-
-  config = types.GenerateContentConfig(
-      response_modalities=['AUDIO'],
-      speech_config=types.SpeechConfig(
-          voice_config=types.VoiceConfig(
-              prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                  voice_name=voice_name
-              )
-          )
-      ),
-  )
+  # Truncate to avoid TTS API limits. Slicing once here also bounds what is
+  # logged below.
+  if len(text) > _MAX_TTS_TEXT_CHARS:
+    text = text[:_MAX_TTS_TEXT_CHARS]
+  logging.info('TTS text (truncated): %s', text)
+  gemini_client = vertex_ai_client.get_vertex_ai_client()
+
+  config = _get_speech_config(voice_name)
   try:
-    response = gemini_client.models.generate_content(
+    response = retry_util.call_with_backoff(
+        gemini_client.models.generate_content,
         model=models.Models.GEMINI_2_5_FLASH_TTS.value,
         contents=types.Content(parts=[types.Part(text=text)], role='user'),
         config=config,
     )
-
-    if (
-        not response.candidates
-        or not response.candidates[0].content
-        or not response.candidates[0].content.parts
-    ):
-      llm_logging.log_operation_end('Generate Audio (TTS)', success=False)
-      raise opal_adk_error.OpalAdkError(
-          status_message='No audio generated.',
-          status_code=code_pb2.INTERNAL,
-          details='generate_audio: TTS model returned no audio data.',
-      )
-
-    pcm_data = response.candidates[0].content.parts[0].inline_data.data  # pytype: disable=attribute-error
-
-    wav_buffer = io.BytesIO()
-    with wave.open(wav_buffer, 'wb') as wf:
-      wf.setnchannels(1)
-      wf.setsampwidth(2)
-      wf.setframerate(24000)
-      wf.writeframes(pcm_data)
-
-    llm_logging.log_operation_end('Generate Audio (TTS)', success=True)
-    return wav_buffer.getvalue(), 'audio/wav'
-
   except Exception as e:
-    if isinstance(e, opal_adk_error.OpalAdkError):
-      raise
-    logging.exception('Failed to generate audio: %s', e)
+    # The raised OpalAdkError logs the error text and chains the original
+    # error, so skip formatting the traceback unless debug logging is on.
+    logging.warning('Failed to generate audio: %s', e)
+    logging.debug('generate_audio: TTS call failed.', exc_info=True)
     llm_logging.log_operation_end('Generate Audio (TTS)', success=False)
     raise opal_adk_error.OpalAdkError(
+        logged=f'generate_audio: TTS call failed: {e}',
         status_message='Failed to generate audio.',
         status_code=code_pb2.INTERNAL,
-        internal_details=str(e),
         details='generate_audio: An error occurred during audio generation.',
+    ) from e
+
+  inline_data = None
+  if (
+      response.candidates
+      and response.candidates[0].content
+      and response.candidates[0].content.parts
+  ):
+    inline_data = response.candidates[0].content.parts[0].inline_data
+  if inline_data is None or not inline_data.data:
+    llm_logging.log_operation_end('Generate Audio (TTS)', success=False)
+    raise opal_adk_error.OpalAdkError(
+        status_message='No audio generated.',
+        status_code=code_pb2.INTERNAL,
+        details='generate_audio: TTS model returned no audio data.',
     )
+
+  wav_data = _pcm_to_wav(inline_data.data)
+
+  llm_logging.log_operation_end('Generate Audio (TTS)', success=True)
+  return wav_data, 'audio/wav'
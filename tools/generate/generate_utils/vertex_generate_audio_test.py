@@ -1,35 +1,61 @@
 """Tests for vertex_generate_audio."""
 
+import io
+import types as python_types
 from unittest import mock
+import wave
 
 from absl.testing import absltest
+from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools.generate.generate_utils import vertex_generate_audio
 from opal_adk.types import models
 
 
-class VertexGenerateAudioTest(absltest.TestCase):
-
-  @mock.patch.object(
-      vertex_generate_audio.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
+def _pcm_response(pcm_data: bytes) -> python_types.SimpleNamespace:
+  """Returns a plain stand-in for a TTS GenerateContentResponse."""
+  part = python_types.SimpleNamespace(
+      inline_data=python_types.SimpleNamespace(data=pcm_data)
+  )
+  return python_types.SimpleNamespace(
+      candidates=[
+          python_types.SimpleNamespace(
+              content=python_types.SimpleNamespace(parts=[part])
+          )
+      ]
   )
-  def test_generate_audio_success(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
 
-    mock_response = mock.Mock()
-    mock_candidate = mock.Mock()
-    mock_content = mock.Mock()
-    mock_part = mock.Mock()
 
-    mock_part.inline_data.data = b'fake_pcm_data'
-    mock_content.parts = [mock_part]
-    mock_candidate.content = mock_content
-    mock_response.candidates = [mock_candidate]
+# The code under test only reads these, so they are shared across tests.
+_PCM_RESPONSE = _pcm_response(b'fake_pcm_data')
+_LONG_TEXT = 'a' * 2000
+
+
+class VertexGenerateAudioTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    # Patch the client factory once for the class; tests only need a fresh
+    # client mock each. An autospecced function would bind as a method when
+    # read through self, so a plain mock is used.
+    cls._client_patcher = mock.patch.object(
+        vertex_ai_client, 'create_vertex_ai_client'
+    )
+    cls.mock_create_client = cls._client_patcher.start()
+    cls.addClassCleanup(cls._client_patcher.stop)
+
+  def setUp(self):
+    super().setUp()
+    # The util reuses a cached client, so drop it to pick up this test's mock.
+    vertex_ai_client.get_vertex_ai_client.cache_clear()
+    self.addCleanup(vertex_ai_client.get_vertex_ai_client.cache_clear)
+    self.mock_create_client.reset_mock(return_value=True, side_effect=True)
+    self.mock_client = mock.Mock()
+    self.mock_create_client.return_value = self.mock_client
 
-    mock_client.models.generate_content.return_value = mock_response
+  def test_generate_audio_success(self):
+    self.mock_client.models.generate_content.return_value = _PCM_RESPONSE
 
     audio_bytes, mime_type = vertex_generate_audio.generate_audio(
         'test text', voice_name='Kore'
@@ -38,8 +64,8 @@ class VertexGenerateAudioTest(absltest.TestCase):
     self.assertTrue(audio_bytes.startswith(b'RIFF'))
     self.assertEqual(mime_type, 'audio/wav')
 
-    mock_client.models.generate_content.assert_called_once()
-    _, kwargs = mock_client.models.generate_content.call_args
+    self.mock_client.models.generate_content.assert_called_once()
+    _, kwargs = self.mock_client.models.generate_content.call_args
     self.assertEqual(kwargs['model'], models.Models.GEMINI_2_5_FLASH_TTS.value)
     self.assertEqual(kwargs['contents'].parts[0].text, 'test text')
     self.assertEqual(kwargs['contents'].role, 'user')
@@ -51,68 +77,86 @@ class VertexGenerateAudioTest(absltest.TestCase):
         'Kore',
     )
 
-  @mock.patch.object(
-      vertex_generate_audio.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
-  )
-  def test_generate_audio_truncates_long_text(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
-
-    mock_response = mock.Mock()
-    mock_candidate = mock.Mock()
-    mock_content = mock.Mock()
-    mock_part = mock.Mock()
+  def test_generate_audio_truncates_long_text(self):
+    self.mock_client.models.generate_content.return_value = _PCM_RESPONSE
 
-    mock_part.inline_data.data = b'fake_pcm_data'
-    mock_content.parts = [mock_part]
-    mock_candidate.content = mock_content
-    mock_response.candidates = [mock_candidate]
-    mock_client.models.generate_content.return_value = mock_response
+    vertex_generate_audio.generate_audio(_LONG_TEXT)
 
-    long_text = 'a' * 2000
-    vertex_generate_audio.generate_audio(long_text)
-
-    _, kwargs = mock_client.models.generate_content.call_args
+    _, kwargs = self.mock_client.models.generate_content.call_args
     sent_text = kwargs['contents'].parts[0].text
     self.assertLen(sent_text, 1000)
 
-  @mock.patch.object(
-      vertex_generate_audio.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
-  )
-  def test_generate_audio_no_candidates(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
-
-    mock_response = mock.Mock()
-    mock_response.candidates = []
-
-    mock_client.models.generate_content.return_value = mock_response
+  def test_generate_audio_no_candidates(self):
+    self.mock_client.models.generate_content.return_value = (
+        python_types.SimpleNamespace(candidates=[])
+    )
 
     with self.assertRaisesRegex(
         opal_adk_error.OpalAdkError, 'No audio generated'
     ):
       vertex_generate_audio.generate_audio('test text')
 
-  @mock.patch.object(
-      vertex_generate_audio.vertex_ai_client,
-      'create_vertex_ai_client',
-      autospec=True,
-  )
-  def test_generate_audio_api_error(self, mock_create_client):
-    mock_client = mock.Mock()
-    mock_create_client.return_value = mock_client
-
-    mock_client.models.generate_content.side_effect = Exception('API failed')
+  def test_generate_audio_part_without_inline_data(self):
+    text_part = python_types.SimpleNamespace(inline_data=None)
+    self.mock_client.models.generate_content.return_value = (
+        python_types.SimpleNamespace(
+            candidates=[
+                python_types.SimpleNamespace(
+                    content=python_types.SimpleNamespace(parts=[text_part])
+                )
+            ]
+        )
+    )
 
     with self.assertRaisesRegex(
-        opal_adk_error.OpalAdkError, 'Failed to generate audio'
+        opal_adk_error.OpalAdkError, 'No audio generated'
     ):
       vertex_generate_audio.generate_audio('test text')
 
+  def test_generate_audio_api_error(self):
+    api_error = Exception('API failed')
+    self.mock_client.models.generate_content.side_effect = api_error
+
+    with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
+      vertex_generate_audio.generate_audio('test text')
+
+    self.assertEqual(cm.exception.status_message, 'Failed to generate audio.')
+    self.assertIn('API failed', str(cm.exception))
+    self.assertNotIn('API failed', cm.exception.details)
+    self.assertIs(cm.exception.__cause__, api_error)
+
+  def test_generate_audio_reuses_config_per_voice(self):
+    self.mock_client.models.generate_content.return_value = _PCM_RESPONSE
+
+    vertex_generate_audio.generate_audio('first', voice_name='Kore')
+    vertex_generate_audio.generate_audio('second', voice_name='Kore')
+    vertex_generate_audio.generate_audio('third', voice_name='Charon')
+
+    configs = [
+        kwargs['config']
+        for _, kwargs in self.mock_client.models.generate_content.call_args_list
+    ]
+    self.assertIs(configs[0], configs[1])
+    self.assertIsNot(configs[0], configs[2])
+    self.assertEqual(
+        configs[2].speech_config.voice_config.prebuilt_voice_config.voice_name,
+        'Charon',
+    )
+
+  def test_pcm_to_wav_matches_wave_module(self):
+    pcm_data = bytes(range(256)) * 3
+
+    expected = io.BytesIO()
+    with wave.open(expected, 'wb') as wf:
+      wf.setnchannels(1)
+      wf.setsampwidth(2)
+      wf.setframerate(24000)
+      wf.writeframes(pcm_data)
+
+    self.assertEqual(
+        vertex_generate_audio._pcm_to_wav(pcm_data), expected.getvalue()
+    )
+
 
 if __name__ == '__main__':
   absltest.main()
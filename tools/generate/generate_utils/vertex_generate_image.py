@@ -1,23 +1,80 @@
+"""Utility function to generate images via the Imagen API."""
+
+import collections
+from concurrent import futures
+import functools
 import logging
+import threading
 
-from google.api_core import exceptions as api_core_exceptions
-from google.genai import errors as genai_errors
+from google import genai
 from google.genai import types
 from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
+from opal_adk.error_handling import retriable
 from opal_adk.types import image_types
 from opal_adk.types import models
+from opal_adk.util import circuit_breaker
+from opal_adk.util import rate_limiter
+from opal_adk.util import response_cache
 
 from google.rpc import code_pb2
 
 
-RETRIABLE_RESPONSE_ERRORS = (
-    api_core_exceptions.TooManyRequests,
-    api_core_exceptions.ResourceExhausted,
-    api_core_exceptions.RetryError,
-    genai_errors.ServerError,
+# Models tried in order, the later ones as fallbacks.
+_IMAGEN_MODELS = (
+    models.Models.IMAGEN_3.value,
+    models.Models.IMAGEN_3_FAST.value,
+)
+# How long a model may run before the next model is also tried as a hedge.
+# Every hedge is a second billed Imagen request, so this sits at the tail of
+# observed Imagen 3 latency (about its p95) rather than the typical latency:
+# only the slowest few percent of requests pay for a hedge.
+_HEDGE_DELAY_SECONDS = 20.0
+# Upper bound on hedge requests in flight across all callers in this process.
+# A hedge is skipped, not queued, when no slot is free, so hedging can never
+# hold up a request's own attempts.
+_MAX_CONCURRENT_HEDGES = 4
+_HEDGE_SEMAPHORE = threading.BoundedSemaphore(_MAX_CONCURRENT_HEDGES)
+# Runs hedge requests only, sized to the semaphore so an admitted hedge always
+# has a free worker.
+_HEDGE_EXECUTOR = futures.ThreadPoolExecutor(
+    max_workers=_MAX_CONCURRENT_HEDGES, thread_name_prefix='imagen-hedge'
 )
 
+# Largest image kept in the response cache, so one oversized result cannot
+# crowd out the rest.
+_MAX_CACHED_IMAGE_BYTES = 8 * 1024 * 1024
+
+# Opt-in cache of generated images; None disables caching.
+_response_cache: response_cache.CacheBackend[tuple[bytes, str]] | None = None
+
+
+def set_response_cache(
+    cache: response_cache.CacheBackend[tuple[bytes, str]] | None,
+) -> None:
+  """Sets the cache used to reuse images for repeated identical requests.
+
+  Args:
+    cache: The cache to use, e.g. a response_cache.InMemoryLRUCache, or None
+      to disable caching.
+  """
+  global _response_cache
+  _response_cache = cache
+
+
+@functools.lru_cache(maxsize=128)
+def _get_images_config(
+    aspect_ratio_value: str, safety_filter_level: str | None
+) -> types.GenerateImagesConfig:
+  """Returns the shared Imagen request config for these settings."""
+  return types.GenerateImagesConfig(
+      number_of_images=1,
+      language='en',
+      aspect_ratio=aspect_ratio_value,
+      safety_filter_level=safety_filter_level,
+      person_generation='allow_all',
+  )
+
 
 def _image_bytes_from_generated_image(
     generated_image: types.GeneratedImage,
@@ -43,6 +100,72 @@ def _image_bytes_from_generated_image(
   )
 
 
+def _generate_with_model(
+    client: genai.Client,
+    model_name: str,
+    image_prompt: str,
+    config: types.GenerateImagesConfig,
+    abandoned: threading.Event,
+) -> tuple[bytes, str] | None:
+  """Makes one Imagen request, updating the model's limiter and breaker.
+
+  Args:
+    client: The client to send the request with.
+    model_name: The Imagen model to use.
+    image_prompt: The text prompt describing the desired image.
+    config: The request config.
+    abandoned: Set once the caller no longer needs this result. A request
+      abandoned before it starts is not sent, and the outcome of one abandoned
+      while running is not recorded on the model's limiter or breaker.
+
+  Returns:
+    Tuple of (image_bytes, mime_type), or None if the model returned no
+    images or the request was abandoned.
+  """
+  if abandoned.is_set():
+    return None
+  limiter = rate_limiter.get_rate_limiter(model_name)
+  breaker = circuit_breaker.get_circuit_breaker(model_name)
+  logging.info('Generating image with %s', model_name)
+  limiter.acquire()
+  try:
+    images = client.models.generate_images(
+        model=model_name,
+        prompt=image_prompt,
+        config=config,
+    )
+  except Exception as e:
+    if retriable.is_retriable(e) and not abandoned.is_set():
+      limiter.record_throttled()
+      breaker.record_failure()
+    raise
+  if abandoned.is_set():
+    return None
+  limiter.record_success()
+  breaker.record_success()
+  if not images:
+    return None
+  return _image_bytes_from_generated_image(images[0])
+
+
+def _start_hedge(
+    client: genai.Client,
+    model_name: str,
+    image_prompt: str,
+    config: types.GenerateImagesConfig,
+    abandoned: threading.Event,
+) -> futures.Future[tuple[bytes, str] | None] | None:
+  """Starts a hedge request, or returns None if no hedge slot is free."""
+  if not _HEDGE_SEMAPHORE.acquire(blocking=False):
+    logging.info('No hedge slot free, not hedging with %s', model_name)
+    return None
+  future = _HEDGE_EXECUTOR.submit(
+      _generate_with_model, client, model_name, image_prompt, config, abandoned
+  )
+  future.add_done_callback(lambda _: _HEDGE_SEMAPHORE.release())
+  return future
+
+
 def generate_image_via_genai_api(
     image_prompt: str,
     aspect_ratio: image_types.AspectRatio = image_types.AspectRatio.RATIO_1_1,
@@ -62,53 +185,119 @@ def generate_image_via_genai_api(
     opal_adk_error.OpalAdkError: If unable to generate image.
   """
   logging.info('Starting Generate Image (Imagen)')
+  cache = _response_cache
+  cache_key = None
+  if cache is not None:
+    cache_key = response_cache.make_cache_key(
+        image_prompt,
+        aspect_ratio.value,
+        image_safety_level.value if image_safety_level else None,
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+      logging.info('Generate Image (Imagen) served from cache.')
+      return cached
   last_exception = None
 
-  # The models we will attempt generation with
-  model_imagen_3_fallbacks = [
-      models.Models.IMAGEN_3.value,
-      models.Models.IMAGEN_3_FAST.value,
-  ]
-
-  client = vertex_ai_client.create_vertex_ai_client()
-
-  for model_name in model_imagen_3_fallbacks:
-    try:
-      logging.info('Generating image with %s', model_name)
-      images = client.models.generate_images(
-          model=model_name,
-          prompt=image_prompt,
-          config=types.GenerateImagesConfig(
-              number_of_images=1,
-              language='en',
-              aspect_ratio=aspect_ratio.value,
-              safety_filter_level=image_safety_level.value
-              if image_safety_level
-              else None,
-              person_generation='allow_all',
-          ),
-      )
-      if images:
-        logging.info('Generate Image (Imagen) completed successfully.')
-        return _image_bytes_from_generated_image(images[0])
-    except RETRIABLE_RESPONSE_ERRORS as e:
-      last_exception = e
+  client = vertex_ai_client.get_vertex_ai_client()
+  config = _get_images_config(
+      aspect_ratio.value,
+      image_safety_level.value if image_safety_level else None,
+  )
+
+  remaining_models = collections.deque()
+  for model_name in _IMAGEN_MODELS:
+    if circuit_breaker.get_circuit_breaker(model_name).allow_request():
+      remaining_models.append(model_name)
+    else:
       logging.warning(
-          'Failed to generate image with model %s: %s. Trying next model.',
-          model_name,
-          e,
+          'Skipping model %s while its circuit breaker is open.', model_name
+      )
+  if not remaining_models:
+    raise opal_adk_error.OpalAdkError(
+        status_message='Image generation is temporarily unavailable.',
+        status_code=code_pb2.UNAVAILABLE,
+        details=(
+            'All image models are temporarily skipped after repeated'
+            ' capacity errors. Please try again later.'
+        ),
+    )
+
+  # Each model gets its own request, started when the previous one fails or,
+  # as a hedge, when it is still running after _HEDGE_DELAY_SECONDS. The
+  # first image returned wins. A request's own attempts run on its own worker
+  # thread, so a slow model cannot starve other callers; hedges share the
+  # bounded _HEDGE_EXECUTOR.
+  executor = futures.ThreadPoolExecutor(
+      max_workers=1, thread_name_prefix='imagen'
+  )
+  abandoned = threading.Event()
+  attempts: dict[futures.Future[tuple[bytes, str] | None], str] = {}
+  pending = set()
+  try:
+    while remaining_models or pending:
+      if not pending:
+        model_name = remaining_models.popleft()
+        future = executor.submit(
+            _generate_with_model,
+            client,
+            model_name,
+            image_prompt,
+            config,
+            abandoned,
+        )
+        attempts[future] = model_name
+        pending.add(future)
+      done, pending = futures.wait(
+          pending,
+          timeout=_HEDGE_DELAY_SECONDS if remaining_models else None,
+          return_when=futures.FIRST_COMPLETED,
       )
-    except Exception as e:  # pylint: disable=broad-exception-caught
-      if 'RESOURCE_EXHAUSTED' in str(e):
-        logging.warning(
-            'Failed to generate image with model %s: %s. Trying next model.',
+      if not done:
+        model_name = remaining_models[0]
+        future = _start_hedge(
+            client, model_name, image_prompt, config, abandoned
+        )
+        if future is None:
+          # Keep waiting on the running attempt; the model stays queued as a
+          # plain fallback.
+          futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+          continue
+        remaining_models.popleft()
+        logging.info(
+            'Image generation still running after %ss, hedging with %s',
+            _HEDGE_DELAY_SECONDS,
             model_name,
-            e,
         )
-        last_exception = e
+        attempts[future] = model_name
+        pending.add(future)
         continue
-      logging.error('Generate Image (Imagen) failed: %s', e)
-      raise opal_adk_error.get_opal_adk_error(e) from e
+      for future in done:
+        try:
+          result = future.result()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+          if not retriable.is_retriable(e):
+            logging.error('Generate Image (Imagen) failed: %s', e)
+            raise opal_adk_error.get_opal_adk_error(e) from e
+          last_exception = e
+          logging.warning(
+              'Failed to generate image with model %s: %s. Trying next model.',
+              attempts[future],
+              e,
+          )
+          continue
+        if result is not None:
+          logging.info('Generate Image (Imagen) completed successfully.')
+          if cache is not None and len(result[0]) <= _MAX_CACHED_IMAGE_BYTES:
+            cache.set(cache_key, result)
+          return result
+  finally:
+    # Losing requests that already started cannot be interrupted; they finish
+    # in the background without updating the limiters or breakers.
+    abandoned.set()
+    for future in pending:
+      future.cancel()
+    executor.shutdown(wait=False)
 
   logging.error('Generate Image (Imagen) failed to generate any images.')
   if last_exception:
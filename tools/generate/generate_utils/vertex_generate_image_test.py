@@ -1,16 +1,36 @@
+import threading
 from unittest import mock
 
 from absl.testing import absltest
+from google.api_core import exceptions as api_core_exceptions
+from google.genai import errors as genai_errors
+from opal_adk.clients import vertex_ai_client
+from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools.generate.generate_utils import vertex_generate_image
-from opal_adk.util import gemini_utils
+from opal_adk.types import models
+from opal_adk.util import circuit_breaker
+from opal_adk.util import rate_limiter
+from opal_adk.util import response_cache
+
+from google.rpc import code_pb2
 
 
 class GenerateImageViaGenaiApiTest(absltest.TestCase):
   """Tests for generate_image_via_genai_api."""
 
-  @mock.patch(
-      'opal_adk.util.gemini_utils.vertex_ai_client.create_vertex_ai_client',
-      autospec=True,
+  def setUp(self):
+    super().setUp()
+    # The util reuses a cached client, so drop it to pick up this test's mock.
+    vertex_ai_client.get_vertex_ai_client.cache_clear()
+    self.addCleanup(vertex_ai_client.get_vertex_ai_client.cache_clear)
+    # Start every test with fresh rate limiters and closed circuit breakers.
+    rate_limiter.get_rate_limiter.cache_clear()
+    self.addCleanup(rate_limiter.get_rate_limiter.cache_clear)
+    circuit_breaker.get_circuit_breaker.cache_clear()
+    self.addCleanup(circuit_breaker.get_circuit_breaker.cache_clear)
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
   )
   def test_success_first_model(self, mock_create_client):
     mock_client = mock.Mock()
@@ -30,16 +50,15 @@ class GenerateImageViaGenaiApiTest(absltest.TestCase):
     self.assertEqual(mime_type, 'image/png')
     self.assertEqual(mock_client.models.generate_images.call_count, 1)
 
-  @mock.patch(
-      'opal_adk.util.gemini_utils.vertex_ai_client.create_vertex_ai_client',
-      autospec=True,
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
   )
   def test_fallback_on_retriable_error(self, mock_create_client):
     mock_client = mock.Mock()
     mock_create_client.return_value = mock_client
 
     # First call raises an error, second succeeds
-    mock_error = gemini_utils.api_core_exceptions.ResourceExhausted('error')
+    mock_error = api_core_exceptions.ResourceExhausted('error')
 
     mock_image = mock.Mock()
     mock_image.image.image_bytes = b'fake_image_bytes2'
@@ -55,17 +74,270 @@ class GenerateImageViaGenaiApiTest(absltest.TestCase):
     self.assertEqual(mime_type, 'image/jpeg')
     self.assertEqual(mock_client.models.generate_images.call_count, 2)
 
-  @mock.patch(
-      'opal_adk.util.gemini_utils.vertex_ai_client.create_vertex_ai_client',
-      autospec=True,
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
   )
   def test_exhausts_fallbacks(self, mock_create_client):
     mock_client = mock.Mock()
     mock_create_client.return_value = mock_client
 
     # All calls raise an error
-    mock_error = gemini_utils.api_core_exceptions.ResourceExhausted('error')
+    mock_error = api_core_exceptions.ResourceExhausted('error')
     mock_client.models.generate_images.side_effect = mock_error
 
-    with self.assertRaises(gemini_utils.opal_adk_error.OpalAdkError):
+    with self.assertRaises(opal_adk_error.OpalAdkError):
+      vertex_generate_image.generate_image_via_genai_api('test prompt')
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  def test_repeated_request_served_from_cache(self, mock_create_client):
+    vertex_generate_image.set_response_cache(
+        response_cache.InMemoryLRUCache()
+    )
+    self.addCleanup(vertex_generate_image.set_response_cache, None)
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+
+    mock_image = mock.Mock()
+    mock_image.image.image_bytes = b'fake_image_bytes'
+    mock_image.image.mime_type = 'image/png'
+    mock_client.models.generate_images.return_value = [mock_image]
+
+    first = vertex_generate_image.generate_image_via_genai_api('test prompt')
+    second = vertex_generate_image.generate_image_via_genai_api('test prompt')
+    vertex_generate_image.generate_image_via_genai_api('other prompt')
+
+    self.assertEqual(first, (b'fake_image_bytes', 'image/png'))
+    self.assertEqual(second, first)
+    self.assertEqual(mock_client.models.generate_images.call_count, 2)
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  def test_config_shared_across_fallbacks_and_calls(self, mock_create_client):
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+    mock_error = api_core_exceptions.ResourceExhausted('error')
+    mock_image = mock.Mock()
+    mock_image.image.image_bytes = b'fake_image_bytes'
+    mock_image.image.mime_type = 'image/png'
+    mock_client.models.generate_images.side_effect = [
+        mock_error,
+        [mock_image],
+        [mock_image],
+    ]
+
+    vertex_generate_image.generate_image_via_genai_api('first prompt')
+    vertex_generate_image.generate_image_via_genai_api('second prompt')
+
+    configs = [
+        kwargs['config']
+        for _, kwargs in mock_client.models.generate_images.call_args_list
+    ]
+    self.assertIs(configs[0], configs[1])
+    self.assertIs(configs[0], configs[2])
+    self.assertEqual(configs[0].aspect_ratio, '1:1')
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  def test_fallback_on_genai_rate_limit(self, mock_create_client):
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+    mock_error = genai_errors.ClientError(
+        429, {'error': {'message': 'quota', 'status': 'RESOURCE_EXHAUSTED'}}
+    )
+    mock_image = mock.Mock()
+    mock_image.image.image_bytes = b'fake_image_bytes'
+    mock_image.image.mime_type = 'image/png'
+    mock_client.models.generate_images.side_effect = [mock_error, [mock_image]]
+
+    image_bytes, _ = vertex_generate_image.generate_image_via_genai_api(
+        'test prompt'
+    )
+
+    self.assertEqual(image_bytes, b'fake_image_bytes')
+    self.assertEqual(mock_client.models.generate_images.call_count, 2)
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  def test_untyped_error_mentioning_resource_exhausted_raises(
+      self, mock_create_client
+  ):
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+    mock_client.models.generate_images.side_effect = ValueError(
+        'prompt mentions RESOURCE_EXHAUSTED'
+    )
+
+    with self.assertRaises(opal_adk_error.OpalAdkError):
+      vertex_generate_image.generate_image_via_genai_api('test prompt')
+    self.assertEqual(mock_client.models.generate_images.call_count, 1)
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  def test_skips_model_with_open_circuit_breaker(self, mock_create_client):
+    breaker = circuit_breaker.get_circuit_breaker(models.Models.IMAGEN_3.value)
+    for _ in range(5):
+      breaker.record_failure()
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+    mock_image = mock.Mock()
+    mock_image.image.image_bytes = b'fake_image_bytes'
+    mock_image.image.mime_type = 'image/png'
+    mock_client.models.generate_images.return_value = [mock_image]
+
+    vertex_generate_image.generate_image_via_genai_api('test prompt')
+
+    mock_client.models.generate_images.assert_called_once()
+    _, kwargs = mock_client.models.generate_images.call_args
+    self.assertEqual(kwargs['model'], models.Models.IMAGEN_3_FAST.value)
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  def test_all_circuit_breakers_open_raises_unavailable(
+      self, mock_create_client
+  ):
+    for model_name in (
+        models.Models.IMAGEN_3.value,
+        models.Models.IMAGEN_3_FAST.value,
+    ):
+      breaker = circuit_breaker.get_circuit_breaker(model_name)
+      for _ in range(5):
+        breaker.record_failure()
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+
+    with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
       vertex_generate_image.generate_image_via_genai_api('test prompt')
+
+    self.assertEqual(cm.exception.error_code, code_pb2.UNAVAILABLE)
+    self.assertNotIn('prompt', cm.exception.details)
+    mock_client.models.generate_images.assert_not_called()
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  @mock.patch.object(vertex_generate_image, '_HEDGE_DELAY_SECONDS', 0.01)
+  def test_hedges_slow_model_with_fallback(self, mock_create_client):
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+    release_slow_model = threading.Event()
+    self.addCleanup(release_slow_model.set)
+
+    def generate_images(model, prompt, config):
+      del prompt, config  # Unused.
+      mock_image = mock.Mock()
+      mock_image.image.mime_type = 'image/png'
+      if model == models.Models.IMAGEN_3.value:
+        release_slow_model.wait()
+        mock_image.image.image_bytes = b'slow_image_bytes'
+      else:
+        mock_image.image.image_bytes = b'fast_image_bytes'
+      return [mock_image]
+
+    mock_client.models.generate_images.side_effect = generate_images
+
+    image_bytes, _ = vertex_generate_image.generate_image_via_genai_api(
+        'test prompt'
+    )
+
+    self.assertEqual(image_bytes, b'fast_image_bytes')
+    self.assertEqual(mock_client.models.generate_images.call_count, 2)
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  @mock.patch.object(vertex_generate_image, '_HEDGE_DELAY_SECONDS', 0.01)
+  def test_skips_hedge_when_no_slot_free(self, mock_create_client):
+    hedge_semaphore = threading.BoundedSemaphore(1)
+    hedge_semaphore.acquire()
+    self.enter_context(
+        mock.patch.object(
+            vertex_generate_image, '_HEDGE_SEMAPHORE', hedge_semaphore
+        )
+    )
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+    first_model_started = threading.Event()
+    release_first_model = threading.Event()
+    self.addCleanup(release_first_model.set)
+
+    def generate_images(model, prompt, config):
+      del model, prompt, config  # Unused.
+      first_model_started.set()
+      release_first_model.wait()
+      mock_image = mock.Mock()
+      mock_image.image.image_bytes = b'fake_image_bytes'
+      mock_image.image.mime_type = 'image/png'
+      return [mock_image]
+
+    mock_client.models.generate_images.side_effect = generate_images
+    # Let the request sit past the hedge delay before the model answers.
+    threading.Timer(0.1, release_first_model.set).start()
+
+    image_bytes, _ = vertex_generate_image.generate_image_via_genai_api(
+        'test prompt'
+    )
+
+    self.assertTrue(first_model_started.is_set())
+    self.assertEqual(image_bytes, b'fake_image_bytes')
+    mock_client.models.generate_images.assert_called_once()
+    _, kwargs = mock_client.models.generate_images.call_args
+    self.assertEqual(kwargs['model'], models.Models.IMAGEN_3.value)
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  @mock.patch.object(vertex_generate_image, '_HEDGE_DELAY_SECONDS', 0.01)
+  def test_losing_hedge_does_not_update_breaker(self, mock_create_client):
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+    release_slow_model = threading.Event()
+    self.addCleanup(release_slow_model.set)
+    slow_model_finished = threading.Event()
+    generate_with_model = vertex_generate_image._generate_with_model
+
+    def tracked_generate_with_model(client, model_name, *args):
+      try:
+        return generate_with_model(client, model_name, *args)
+      finally:
+        if model_name == models.Models.IMAGEN_3.value:
+          slow_model_finished.set()
+
+    self.enter_context(
+        mock.patch.object(
+            vertex_generate_image,
+            '_generate_with_model',
+            side_effect=tracked_generate_with_model,
+        )
+    )
+
+    def generate_images(model, prompt, config):
+      del prompt, config  # Unused.
+      if model == models.Models.IMAGEN_3.value:
+        release_slow_model.wait()
+        raise api_core_exceptions.ResourceExhausted('error')
+      mock_image = mock.Mock()
+      mock_image.image.image_bytes = b'fast_image_bytes'
+      mock_image.image.mime_type = 'image/png'
+      return [mock_image]
+
+    mock_client.models.generate_images.side_effect = generate_images
+    breaker = circuit_breaker.get_circuit_breaker(models.Models.IMAGEN_3.value)
+
+    with mock.patch.object(
+        breaker, 'record_failure', autospec=True
+    ) as mock_record_failure:
+      image_bytes, _ = vertex_generate_image.generate_image_via_genai_api(
+          'test prompt'
+      )
+      release_slow_model.set()
+      self.assertTrue(slow_model_finished.wait(timeout=5))
+
+    self.assertEqual(image_bytes, b'fast_image_bytes')
+    mock_record_failure.assert_not_called()
@@ -1,148 +1,220 @@
 
 """Utilities for interacting with the Gemini API."""
 
+import asyncio
+import functools
 import logging
+import random
 import time
+from typing import Any
 
-from google.api_core import exceptions as api_core_exceptions
-from google.genai import errors as genai_errors
 from google.genai import types
 from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
+from opal_adk.error_handling import retriable
 from opal_adk.types import image_types
 from opal_adk.types import models
+from opal_adk.util import circuit_breaker
+from opal_adk.util import rate_limiter
 
 from google.rpc import code_pb2
 
 
 Part = types.Part
 
-RETRIABLE_RESPONSE_ERRORS = (
-    api_core_exceptions.TooManyRequests,
-    api_core_exceptions.ResourceExhausted,
-    api_core_exceptions.RetryError,
-    genai_errors.ServerError,
+_DEFAULT_VEO_MODEL = models.Models.VEO_3_FAST.value
+# Models tried, in order, after the requested one.
+_VEO_FALLBACK_MODELS = (
+    models.Models.VEO_3.value,
+    models.Models.VEO_3_FAST.value,
 )
 
+# Veo operations take tens of seconds, so polling starts short and backs off
+# exponentially (with jitter, so concurrent jobs do not poll in lockstep).
+_POLL_BASE_DELAY_SECONDS = 2.0
+_POLL_MAX_DELAY_SECONDS = 30.0
+_POLL_JITTER = 0.5
 
-def _generate_video_impl(
+
+def _poll_delay_seconds(attempt: int) -> float:
+  """Returns how long to wait before the given operation poll attempt."""
+  delay = min(
+      _POLL_MAX_DELAY_SECONDS, _POLL_BASE_DELAY_SECONDS * (2**attempt)
+  )
+  return delay * (1 + random.uniform(0, _POLL_JITTER))
+
+
+def _get_video_image_config(
+    reference_image_parts: list[types.Part] | None,
+    current_model: str,
+) -> tuple[
+    types.Image | None,
+    list[types.VideoGenerationReferenceImage] | None,
+]:
+  """Returns (base_image, reference_images) for the given model."""
+  if not reference_image_parts:
+    return None, None
+  if current_model in (
+      models.Models.VEO_3_1.value,
+      models.Models.VEO_3_1_FAST.value,
+  ):
+    ref_images = [
+        types.VideoGenerationReferenceImage(
+            image=types.Image(
+                image_bytes=part.inline_data.data,
+                mime_type=part.inline_data.mime_type,
+            ),
+            reference_type='ASSET',
+        )
+        for part in reference_image_parts
+        if part.inline_data
+    ]
+    return None, ref_images
+  else:
+    first_part = reference_image_parts[0]
+    if first_part.inline_data:
+      return (
+          types.Image(
+              image_bytes=first_part.inline_data.data,
+              mime_type=first_part.inline_data.mime_type,
+          ),
+          None,
+      )
+    return None, None
+
+
+@functools.lru_cache(maxsize=8)
+def _video_fallbacks(model_name: str) -> tuple[str, ...]:
+  """Returns the deduplicated models to try in order for model_name."""
+  return tuple(dict.fromkeys((model_name, *_VEO_FALLBACK_MODELS)))
+
+
+def _fallback_models(model_name: str) -> list[str]:
+  """Returns the models to try in order, starting with model_name.
+
+  Models whose circuit breaker is open are left out.
+
+  Raises:
+    opal_adk_error.OpalAdkError: If every model's circuit breaker is open.
+  """
+  available = []
+  for fall_back in _video_fallbacks(model_name):
+    if circuit_breaker.get_circuit_breaker(fall_back).allow_request():
+      available.append(fall_back)
+    else:
+      logging.warning(
+          'Skipping model %s while its circuit breaker is open.', fall_back
+      )
+  if not available:
+    raise opal_adk_error.OpalAdkError(
+        status_message='Video generation is temporarily unavailable.',
+        status_code=code_pb2.UNAVAILABLE,
+        details=(
+            'All video models are temporarily skipped after repeated'
+            ' capacity errors. Please try again later.'
+        ),
+    )
+  return available
+
+
+@functools.lru_cache(maxsize=128)
+def _get_videos_config(
+    aspect_ratio_value: str,
+    disable_prompt_rewrite: bool,
+    duration_seconds: int,
+) -> types.GenerateVideosConfig:
+  """Returns the shared Veo request config, without reference images."""
+  return types.GenerateVideosConfig(
+      aspect_ratio=aspect_ratio_value,
+      person_generation='allow_adult',
+      enhance_prompt='no' if disable_prompt_rewrite else 'yes',
+      duration_seconds=duration_seconds,
+  )
+
+
+def _generate_videos_kwargs(
     text_prompt: str,
     reference_image_parts: list[types.Part] | None,
     disable_prompt_rewrite: bool,
     aspect_ratio: image_types.AspectRatio,
     duration_seconds: int,
-    model_name: str,
-) -> tuple[bytes, str]:
-  """Internal implementation of video generation."""
+    current_model: str,
+) -> dict[str, Any]:
+  """Returns the generate_videos arguments for one model attempt."""
+  current_base_image, current_reference_images = _get_video_image_config(
+      reference_image_parts, current_model
+  )
+  config = _get_videos_config(
+      aspect_ratio.value, disable_prompt_rewrite, duration_seconds
+  )
+  if current_reference_images:
+    # Reference images vary per call, so attach them to a copy of the shared
+    # config rather than validating a whole new one.
+    config = config.model_copy(
+        update={'reference_images': current_reference_images}
+    )
+  return dict(
+      model=current_model,
+      prompt=text_prompt,
+      image=current_base_image,
+      config=config,
+  )
 
-  def _get_video_image_config(
-      current_model: str,
-  ) -> tuple[
-      types.Image | None,
-      list[types.VideoGenerationReferenceImage] | None,
-  ]:
-    """Returns (base_image, reference_images) for the given model."""
-    if not reference_image_parts:
-      return None, None
-    if current_model in (
-        models.Models.VEO_3_1.value,
-        models.Models.VEO_3_1_FAST.value,
-    ):
-      ref_images = [
-          types.VideoGenerationReferenceImage(
-              image=types.Image(
-                  image_bytes=part.inline_data.data,
-                  mime_type=part.inline_data.mime_type,
-              ),
-              reference_type='ASSET',
-          )
-          for part in reference_image_parts
-          if part.inline_data
-      ]
-      return None, ref_images
-    else:
-      first_part = reference_image_parts[0]
-      if first_part.inline_data:
-        return (
-            types.Image(
-                image_bytes=first_part.inline_data.data,
-                mime_type=first_part.inline_data.mime_type,
-            ),
-            None,
-        )
-      return None, None
 
-  fall_backs = [
-      model_name,
-      models.Models.VEO_3.value,
-      models.Models.VEO_3_FAST.value,
-  ]
-  # Deduplicate fallbacks while preserving order
-  fall_backs = list(dict.fromkeys(fall_backs))
+def _handle_generate_videos_error(current_model: str, e: Exception) -> None:
+  """Records a capacity failure and logs it, or raises otherwise.
 
-  operation = None
-  client = vertex_ai_client.create_vertex_ai_client()
+  Args:
+    current_model: The model the request was sent to.
+    e: The error raised by generate_videos.
 
-  for current_model in fall_backs:
-    current_base_image, current_reference_images = _get_video_image_config(
-        current_model
+  Raises:
+    opal_adk_error.OpalAdkError: If the next model should not be tried.
+  """
+  if retriable.is_retriable(e):
+    rate_limiter.get_rate_limiter(current_model).record_throttled()
+    circuit_breaker.get_circuit_breaker(current_model).record_failure()
+    logging.warning(
+        'Retriable error when calling Veo with model %s: %s, '
+        'retrying on inferior model.',
+        current_model,
+        e,
     )
+    return
+  logging.exception(
+      'Failed to create video LRO with model %s: %s',
+      current_model,
+      e,
+  )
+  raise opal_adk_error.OpalAdkError(
+      status_message='Failed to initiate video request.',
+      status_code=code_pb2.INTERNAL,
+      details='Internal error occurred.',
+  ) from e
 
-    config = types.GenerateVideosConfig(
-        aspect_ratio=aspect_ratio.value,
-        person_generation='allow_adult',
-        enhance_prompt='no' if disable_prompt_rewrite else 'yes',
-        duration_seconds=duration_seconds,
-        reference_images=current_reference_images,
-    )
 
-    try:
-      operation = client.models.generate_videos(
-          model=current_model,
-          prompt=text_prompt,
-          image=current_base_image,
-          config=config,
-      )
-      break
-    except RETRIABLE_RESPONSE_ERRORS as e:
-      logging.warning(
-          'Retriable error when calling Veo with model %s: %s, '
-          'retrying on inferior model.',
-          current_model,
-          e,
-      )
-      continue
-    except Exception as e:  # pylint: disable=broad-exception-caught
-      if 'RESOURCE_EXHAUSTED' in str(e):
-        logging.warning(
-            'RESOURCE_EXHAUSTED when generating video with model %s: %s, '
-            'trying next model.',
-            current_model,
-            e,
-        )
-        continue
-      logging.exception(
-          'Failed to create video LRO with model %s: %s',
-          current_model,
-          e,
-      )
-      raise opal_adk_error.OpalAdkError(
-          status_message='Failed to initiate video request.',
-          status_code=code_pb2.INTERNAL,
-          details='Internal error occurred.',
-      ) from e
+def _no_operation_error() -> opal_adk_error.OpalAdkError:
+  return opal_adk_error.OpalAdkError(
+      status_message='Failed to initiate video request.',
+      status_code=code_pb2.INTERNAL,
+      details='Internal error occurred.',
+  )
 
-  if not operation:
-    raise opal_adk_error.OpalAdkError(
-        status_message='Failed to initiate video request.',
-        status_code=code_pb2.INTERNAL,
-        details='Internal error occurred.',
-    )
 
-  while not operation.done:
-    time.sleep(3)
-    operation = client.operations.get(operation)
+def _video_from_operation(
+    operation: types.GenerateVideosOperation,
+) -> tuple[bytes, str]:
+  """Returns (video_bytes, mime_type) from a finished Veo operation.
 
+  Args:
+    operation: The completed generate_videos operation.
+
+  Returns:
+    A tuple of (video_bytes, mime_type).
+
+  Raises:
+    opal_adk_error.OpalAdkError: If the operation produced no video.
+  """
   # Check response
   if operation.error:
     logging.warning('Vertex Veo failed to generate video: %s', operation.error)
@@ -176,6 +248,110 @@ def _generate_video_impl(
     return res.video_bytes, res.mime_type
 
 
+def _generate_video_impl(
+    text_prompt: str,
+    reference_image_parts: list[types.Part] | None,
+    disable_prompt_rewrite: bool,
+    aspect_ratio: image_types.AspectRatio,
+    duration_seconds: int,
+    model_name: str,
+) -> tuple[bytes, str]:
+  """Internal implementation of video generation."""
+  operation = None
+  client = vertex_ai_client.get_vertex_ai_client()
+
+  for current_model in _fallback_models(model_name):
+    limiter = rate_limiter.get_rate_limiter(current_model)
+    try:
+      limiter.acquire()
+      operation = client.models.generate_videos(
+          **_generate_videos_kwargs(
+              text_prompt,
+              reference_image_parts,
+              disable_prompt_rewrite,
+              aspect_ratio,
+              duration_seconds,
+              current_model,
+          )
+      )
+      limiter.record_success()
+      circuit_breaker.get_circuit_breaker(current_model).record_success()
+      break
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      _handle_generate_videos_error(current_model, e)
+
+  if not operation:
+    raise _no_operation_error()
+
+  poll_attempt = 0
+  while not operation.done:
+    time.sleep(_poll_delay_seconds(poll_attempt))
+    poll_attempt += 1
+    operation = client.operations.get(operation)
+
+  return _video_from_operation(operation)
+
+
+async def _generate_video_impl_async(
+    text_prompt: str,
+    reference_image_parts: list[types.Part] | None,
+    disable_prompt_rewrite: bool,
+    aspect_ratio: image_types.AspectRatio,
+    duration_seconds: int,
+    model_name: str,
+) -> tuple[bytes, str]:
+  """Async implementation of video generation.
+
+  Polls the operation with asyncio.sleep, so one event loop can wait on many
+  Veo operations at once.
+  """
+  operation = None
+  client = vertex_ai_client.get_vertex_ai_client()
+
+  for current_model in _fallback_models(model_name):
+    limiter = rate_limiter.get_rate_limiter(current_model)
+    try:
+      await limiter.acquire_async()
+      operation = await client.aio.models.generate_videos(
+          **_generate_videos_kwargs(
+              text_prompt,
+              reference_image_parts,
+              disable_prompt_rewrite,
+              aspect_ratio,
+              duration_seconds,
+              current_model,
+          )
+      )
+      limiter.record_success()
+      circuit_breaker.get_circuit_breaker(current_model).record_success()
+      break
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      _handle_generate_videos_error(current_model, e)
+
+  if not operation:
+    raise _no_operation_error()
+
+  poll_attempt = 0
+  while not operation.done:
+    await asyncio.sleep(_poll_delay_seconds(poll_attempt))
+    poll_attempt += 1
+    operation = await client.aio.operations.get(operation)
+
+  return _video_from_operation(operation)
+
+
+def _normalize_aspect_ratio(
+    aspect_ratio: image_types.AspectRatio,
+) -> image_types.AspectRatio:
+  """Returns aspect_ratio if Veo supports it, else 16:9."""
+  if aspect_ratio not in (
+      image_types.AspectRatio.RATIO_16_9,
+      image_types.AspectRatio.RATIO_9_16,
+  ):
+    return image_types.AspectRatio.RATIO_16_9
+  return aspect_ratio
+
+
 def generate_video_via_vertex_ai(
     text_prompt: str,
     reference_image_parts: list[types.Part] | None = None,
@@ -200,14 +376,10 @@ def generate_video_via_vertex_ai(
     A tuple of (video_bytes, mime_type).
   """
   logging.info('Starting Generate Video (Veo)')
-  if aspect_ratio not in (
-      image_types.AspectRatio.RATIO_16_9,
-      image_types.AspectRatio.RATIO_9_16,
-  ):
-    aspect_ratio = image_types.AspectRatio.RATIO_16_9
+  aspect_ratio = _normalize_aspect_ratio(aspect_ratio)
 
   if model_name is None:
-    model_name = models.Models.VEO_3_FAST.value
+    model_name = _DEFAULT_VEO_MODEL
 
   try:
     video_bytes, mime_type = _generate_video_impl(
@@ -223,3 +395,53 @@ def generate_video_via_vertex_ai(
   except Exception as e:
     logging.error('Video generation failed: %s', e)
     raise
+
+
+async def generate_videos_batch(
+    text_prompts: list[str],
+    reference_image_parts: list[types.Part] | None = None,
+    disable_prompt_rewrite: bool = False,
+    aspect_ratio: image_types.AspectRatio = image_types.AspectRatio.RATIO_16_9,
+    duration_seconds: int = 8,
+    model_name: str | None = None,
+) -> list[tuple[bytes, str]]:
+  """Generates one video per prompt with Veo, running the requests concurrently.
+
+  Args:
+    text_prompts: The text prompts, one per video.
+    reference_image_parts: Optional list of genai.Parts containing reference
+      images, shared by every prompt. See generate_video_via_vertex_ai.
+    disable_prompt_rewrite: Whether to disable automatic prompt rewriting.
+    aspect_ratio: Video aspect ratio ('16:9' or '9:16').
+    duration_seconds: Duration of each generated video.
+    model_name: The VEO model to use. Defaults to MODEL_VEO_3_FAST.
+
+  Returns:
+    A (video_bytes, mime_type) tuple for each prompt, in order.
+
+  Raises:
+    opal_adk_error.OpalAdkError: If any video fails to generate.
+  """
+  logging.info('Starting Generate Videos Batch (Veo)')
+  aspect_ratio = _normalize_aspect_ratio(aspect_ratio)
+
+  if model_name is None:
+    model_name = _DEFAULT_VEO_MODEL
+
+  try:
+    videos = await asyncio.gather(*(
+        _generate_video_impl_async(
+            text_prompt=text_prompt,
+            reference_image_parts=reference_image_parts,
+            disable_prompt_rewrite=disable_prompt_rewrite,
+            aspect_ratio=aspect_ratio,
+            duration_seconds=duration_seconds,
+            model_name=model_name,
+        )
+        for text_prompt in text_prompts
+    ))
+    logging.info('Generate Videos Batch (Veo) completed successfully.')
+    return list(videos)
+  except Exception as e:
+    logging.error('Batch video generation failed: %s', e)
+    raise
@@ -1,14 +1,34 @@
+import unittest
 from unittest import mock
 
 from absl.testing import absltest
 from google.api_core import exceptions as api_core_exceptions
+from google.genai import types
+from opal_adk.clients import vertex_ai_client
 from opal_adk.error_handling import opal_adk_error
 from opal_adk.tools.generate.generate_utils import vertex_generate_video
+from opal_adk.types import image_types
+from opal_adk.types import models
+from opal_adk.util import circuit_breaker
+from opal_adk.util import rate_limiter
+
+from google.rpc import code_pb2
 
 
 class GenerateVideoViaVertexAiTest(absltest.TestCase):
   """Tests for generate_video_via_vertex_ai."""
 
+  def setUp(self):
+    super().setUp()
+    # The util reuses a cached client, so drop it to pick up this test's mock.
+    vertex_ai_client.get_vertex_ai_client.cache_clear()
+    self.addCleanup(vertex_ai_client.get_vertex_ai_client.cache_clear)
+    # Start every test with fresh rate limiters and closed circuit breakers.
+    rate_limiter.get_rate_limiter.cache_clear()
+    self.addCleanup(rate_limiter.get_rate_limiter.cache_clear)
+    circuit_breaker.get_circuit_breaker.cache_clear()
+    self.addCleanup(circuit_breaker.get_circuit_breaker.cache_clear)
+
   @mock.patch(
       'opal_adk.util.gemini_utils.vertex_ai_client.create_vertex_ai_client',
       autospec=True,
@@ -108,3 +128,166 @@ class GenerateVideoViaVertexAiTest(absltest.TestCase):
 
     with self.assertRaisesRegex(opal_adk_error.OpalAdkError, 'bad prompt'):
       vertex_generate_video.generate_video_via_vertex_ai('test video prompt')
+
+  @mock.patch.object(
+      vertex_ai_client, 'create_vertex_ai_client', autospec=True
+  )
+  def test_all_circuit_breakers_open_raises_unavailable(
+      self, mock_create_client
+  ):
+    for model_name in (
+        models.Models.VEO_3.value,
+        models.Models.VEO_3_FAST.value,
+    ):
+      breaker = circuit_breaker.get_circuit_breaker(model_name)
+      for _ in range(5):
+        breaker.record_failure()
+    mock_client = mock.Mock()
+    mock_create_client.return_value = mock_client
+
+    with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
+      vertex_generate_video.generate_video_via_vertex_ai('test video prompt')
+
+    self.assertEqual(cm.exception.error_code, code_pb2.UNAVAILABLE)
+    mock_client.models.generate_videos.assert_not_called()
+
+  @mock.patch.object(
+      vertex_generate_video.random, 'uniform', autospec=True, return_value=0.0
+  )
+  def test_poll_delay_grows_exponentially_and_caps(self, _):
+    delays = [vertex_generate_video._poll_delay_seconds(i) for i in range(6)]
+
+    self.assertEqual(delays, [2.0, 4.0, 8.0, 16.0, 30.0, 30.0])
+
+  @mock.patch.object(
+      vertex_generate_video.random, 'uniform', autospec=True, return_value=0.5
+  )
+  def test_poll_delay_adds_jitter(self, mock_uniform):
+    self.assertEqual(vertex_generate_video._poll_delay_seconds(0), 3.0)
+    mock_uniform.assert_called_once_with(0, 0.5)
+
+  def test_video_fallbacks_deduplicated_in_order(self):
+    self.assertEqual(
+        vertex_generate_video._video_fallbacks(models.Models.VEO_3_1.value),
+        (
+            models.Models.VEO_3_1.value,
+            models.Models.VEO_3.value,
+            models.Models.VEO_3_FAST.value,
+        ),
+    )
+    self.assertEqual(
+        vertex_generate_video._video_fallbacks(models.Models.VEO_3.value),
+        (models.Models.VEO_3.value, models.Models.VEO_3_FAST.value),
+    )
+
+  def test_videos_config_shared_unless_reference_images(self):
+    reference_parts = [
+        types.Part.from_bytes(data=b'img', mime_type='image/png')
+    ]
+    kwargs = [
+        vertex_generate_video._generate_videos_kwargs(
+            'prompt',
+            parts,
+            False,
+            image_types.AspectRatio.RATIO_16_9,
+            8,
+            models.Models.VEO_3_1.value,
+        )
+        for parts in (None, None, reference_parts)
+    ]
+
+    self.assertIs(kwargs[0]['config'], kwargs[1]['config'])
+    self.assertIsNone(kwargs[0]['config'].reference_images)
+    self.assertLen(kwargs[2]['config'].reference_images, 1)
+    self.assertEqual(kwargs[2]['config'].aspect_ratio, '16:9')
+
+
+class GenerateVideosBatchTest(
+    absltest.TestCase, unittest.IsolatedAsyncioTestCase
+):
+  """Tests for generate_videos_batch."""
+
+  def setUp(self):
+    super().setUp()
+    vertex_ai_client.get_vertex_ai_client.cache_clear()
+    self.addCleanup(vertex_ai_client.get_vertex_ai_client.cache_clear)
+    # Start every test with fresh rate limiters and closed circuit breakers.
+    rate_limiter.get_rate_limiter.cache_clear()
+    self.addCleanup(rate_limiter.get_rate_limiter.cache_clear)
+    circuit_breaker.get_circuit_breaker.cache_clear()
+    self.addCleanup(circuit_breaker.get_circuit_breaker.cache_clear)
+    mock_create_client = self.enter_context(
+        mock.patch.object(
+            vertex_ai_client, 'create_vertex_ai_client', autospec=True
+        )
+    )
+    self.mock_aio = mock_create_client.return_value.aio
+    self.mock_aio.models.generate_videos = mock.AsyncMock()
+    self.mock_aio.operations.get = mock.AsyncMock()
+    self.mock_sleep = self.enter_context(
+        mock.patch.object(
+            vertex_generate_video.asyncio, 'sleep', autospec=True
+        )
+    )
+
+  def _done_operation(self, video_bytes: bytes) -> mock.Mock:
+    operation = mock.Mock(done=True, error=None)
+    video = mock.Mock()
+    video.video.video_bytes = video_bytes
+    video.video.mime_type = 'video/mp4'
+    operation.response.generated_videos = [video]
+    return operation
+
+  async def test_returns_video_per_prompt_in_order(self):
+    pending = mock.Mock(done=False)
+    self.mock_aio.models.generate_videos.side_effect = [
+        pending,
+        self._done_operation(b'second_video'),
+    ]
+    self.mock_aio.operations.get.return_value = self._done_operation(
+        b'first_video'
+    )
+
+    videos = await vertex_generate_video.generate_videos_batch(
+        ['first prompt', 'second prompt']
+    )
+
+    self.assertEqual(
+        videos, [(b'first_video', 'video/mp4'), (b'second_video', 'video/mp4')]
+    )
+    self.mock_aio.operations.get.assert_awaited_once_with(pending)
+    self.mock_sleep.assert_awaited_once()
+
+  async def test_falls_back_on_resource_exhausted(self):
+    self.mock_aio.models.generate_videos.side_effect = [
+        api_core_exceptions.ResourceExhausted('error'),
+        self._done_operation(b'fallback_video'),
+    ]
+
+    videos = await vertex_generate_video.generate_videos_batch(['prompt'])
+
+    self.assertEqual(videos, [(b'fallback_video', 'video/mp4')])
+    self.assertEqual(self.mock_aio.models.generate_videos.await_count, 2)
+
+  async def test_non_retriable_error_raises(self):
+    self.mock_aio.models.generate_videos.side_effect = ValueError('bad')
+
+    with self.assertRaisesRegex(
+        opal_adk_error.OpalAdkError, 'Failed to initiate video request'
+    ):
+      await vertex_generate_video.generate_videos_batch(['prompt'])
+
+  async def test_all_circuit_breakers_open_raises_unavailable(self):
+    for model_name in (
+        models.Models.VEO_3.value,
+        models.Models.VEO_3_FAST.value,
+    ):
+      breaker = circuit_breaker.get_circuit_breaker(model_name)
+      for _ in range(5):
+        breaker.record_failure()
+
+    with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
+      await vertex_generate_video.generate_videos_batch(['prompt'])
+
+    self.assertEqual(cm.exception.error_code, code_pb2.UNAVAILABLE)
+    self.mock_aio.models.generate_videos.assert_not_awaited()
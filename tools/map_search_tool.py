@@ -4,18 +4,87 @@ This tool provides a function to connect to the Google Maps Places API
 and perform text-based searches for locations and establishments.
 """
 
+import asyncio
+from concurrent import futures
+import functools
 import logging
+import threading
 from typing import Any
 
 from google.adk.tools import base_tool
-from google.adk.tools import tool_context
+from google.adk.tools import tool_context as tc
 import googlemaps
 from googlemaps import exceptions
 from opal_adk import flags
 from opal_adk.error_handling import opal_adk_error
+from opal_adk.util import response_cache
 
 from google.rpc import code_pb2
 
+# Places results are billable and stable for minutes, so identical queries
+# within this window reuse the earlier response.
+_PLACES_CACHE_TTL_SECONDS = 300
+_PLACES_CACHE = response_cache.InMemoryLRUCache(
+    max_entries=1024, ttl_seconds=_PLACES_CACHE_TTL_SECONDS
+)
+# Lookups currently being fetched, so concurrent identical queries share one
+# API call.
+_in_flight_places: dict[str, futures.Future[Any]] = {}
+_in_flight_places_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _get_gmaps_client(api_key: str) -> googlemaps.Client:
+  """Returns a shared client per API key, so its HTTP session is reused."""
+  return googlemaps.Client(key=api_key)
+
+
+def _places_cache_key(query: str) -> str:
+  return query.strip().lower()
+
+
+def _search_places(api_key: str, query: str) -> dict[str, Any] | str:
+  """Returns Places API results for a query, reusing recent identical lookups.
+
+  Args:
+    api_key: The Google Maps Platform API key.
+    query: The text string to search for.
+
+  Returns:
+    The raw results from the Places API.
+  """
+  key = _places_cache_key(query)
+  results = _PLACES_CACHE.get(key)
+  if results is not None:
+    return results
+
+  with _in_flight_places_lock:
+    future = _in_flight_places.get(key)
+    is_owner = future is None
+    if is_owner:
+      future = _in_flight_places[key] = futures.Future()
+  if not is_owner:
+    return future.result()
+
+  try:
+    results = _get_gmaps_client(api_key).places(query=query)
+  except Exception as e:
+    future.set_exception(e)
+    raise
+  else:
+    _PLACES_CACHE.set(key, results)
+    future.set_result(results)
+    return results
+  finally:
+    with _in_flight_places_lock:
+      del _in_flight_places[key]
+
+
+def _text_field(place: dict[str, Any], key: str, default: str) -> str:
+  """Returns the text of a localized-text field of a place, or default."""
+  field = place.get(key)
+  return field.get("text", default) if field else default
+
 
 def _format_results(query: str, results: dict[str, Any] | str) -> str:
   """Formats Google Maps search results into a readable string.
@@ -30,37 +99,109 @@ def _format_results(query: str, results: dict[str, Any] | str) -> str:
   Returns:
     A formatted string of the search results.
   """
+  # The output is assembled from parts and joined once, rather than building
+  # an intermediate string per place.
+  parts = [
+      "Search Query: ",
+      query,
+      "\n\n## Google Places Search Results\n\n",
+  ]
   if isinstance(results, str):
-    return f"""Search Query: {query}
+    parts.append(results)
+    return "".join(parts)
 
-## Google Places Search Results
+  for i, place in enumerate(results.get("results", [])):
+    if i:
+      parts.append("\n\n")
+    display_name = _text_field(place, "displayName", "N/A")
+    website_uri = place.get("websiteUri")
+    if website_uri:
+      parts += ("- [", display_name, "](", website_uri, ")")
+    else:
+      parts += ("- ", display_name)
+    parts += (
+        "\n  ",
+        _text_field(place, "editorialSummary", ""),
+        "\n  Address: ",
+        place.get("formattedAddress", "N/A"),
+        "\n  User Rating: ",
+        str(place.get("rating", "N/A")),
+        " (",
+        str(place.get("userRatingCount", "N/A")),
+        " reviews)",
+    )
 
-{results}"""
+  return "".join(parts)
 
-  formatted_places = []
-  for place in results.get("results", []):
-    display_name = place.get("displayName", {}).get("text", "N/A")
-    website_uri = place.get("websiteUri")
-    title = f"[{display_name}]({website_uri})" if website_uri else display_name
 
-    editorial_summary = place.get("editorialSummary", {}).get("text", "")
-    formatted_address = place.get("formattedAddress", "N/A")
-    rating = place.get("rating", "N/A")
-    user_rating_count = place.get("userRatingCount", "N/A")
+def _get_maps_api_key() -> str:
+  """Returns the Maps API key, raising if it is not configured."""
+  api_key = flags.get_maps_api_key()
+  if not api_key:
+    raise opal_adk_error.OpalAdkError(
+        logged="map_search_tool: Google Maps Platform API key is required.",
+        status_message=(
+            "map_search_tool: Google Maps Platform API key is required."
+        ),
+        status_code=code_pb2.FAILED_PRECONDITION,
+    )
+  return api_key
+
+
+def _search_and_format(api_key: str, query: str) -> str:
+  """Searches Places for a query and returns the formatted results.
+
+  Args:
+    api_key: The Google Maps Platform API key.
+    query: The text string to search for.
+
+  Returns:
+    The formatted search results.
+
+  Raises:
+    opal_adk_error.OpalAdkError: If the Places API call fails.
+  """
+  try:
+    results = _search_places(api_key, query)
+    return _format_results(query, results)
+  except exceptions.ApiError as e:
+    logging.exception("Google Maps API Error: %s", e)
+    raise opal_adk_error.OpalAdkError(
+        logged=f"map_search_tool: Google Maps API error: {e}",
+        status_message="map_search_tool: Error with Google Maps API key.",
+        status_code=code_pb2.FAILED_PRECONDITION,
+    ) from e
+  except Exception as e:
+    logging.exception("An unexpected error occurred: %s", e)
+    raise opal_adk_error.OpalAdkError(
+        logged=f"map_search_tool: Internal error: {e}",
+        status_message="map_search_tool: Internal error.",
+        status_code=code_pb2.INTERNAL,
+    ) from e
 
-    formatted_place = f"""- {title}
-  {editorial_summary}
-  Address: {formatted_address}
-  User Rating: {rating} ({user_rating_count} reviews)"""
-    formatted_places.append(formatted_place)
 
-  places_str = "\n\n".join(formatted_places)
+async def search_places_batch(queries: list[str]) -> list[str]:
+  """Searches Google Maps Places for several queries concurrently.
 
-  return f"""Search Query: {query}
+  The googlemaps client is blocking, so each query runs in a worker thread
+  while sharing the cached client, its connection pool and the results cache.
+
+  Args:
+    queries: The text strings to search for.
 
-## Google Places Search Results
+  Returns:
+    The formatted search results for each query, in order.
 
-{places_str}"""
+  Raises:
+    opal_adk_error.OpalAdkError: If the API key is missing or any search fails.
+  """
+  api_key = _get_maps_api_key()
+  return list(
+      await asyncio.gather(*(
+          asyncio.to_thread(_search_and_format, api_key, query)
+          for query in queries
+      ))
+  )
 
 
 class MapSearchTool(base_tool.BaseTool):
@@ -77,7 +218,7 @@ class MapSearchTool(base_tool.BaseTool):
     )
 
   def __call__(
-      self, query: str, context: tool_context.ToolContext
+      self, query: str, context: tc.ToolContext
   ) -> dict[str, Any]:
     """Connects to Google Maps Places API and performs a text search.
 
@@ -92,32 +233,24 @@ class MapSearchTool(base_tool.BaseTool):
       A dictionary containing the search results from the Places API.
       Returns an empty dictionary if an error occurs.
     """
-    api_key = flags.get_maps_api_key()
-    if not api_key:
-      raise opal_adk_error.OpalAdkError(
-          logged="map_search_tool: Google Maps Platform API key is required.",
-          status_message=(
-              "map_search_tool: Google Maps Platform API key is required."
-          ),
-          status_code=code_pb2.FAILED_PRECONDITION,
-      )
-
-    gmaps = googlemaps.Client(key=api_key)
-
-    try:
-      results = gmaps.places(query=query)
-      return {"result": _format_results(query, results)}
-    except exceptions.ApiError as e:
-      logging.exception("Google Maps API Error: %s", e)
-      raise opal_adk_error.OpalAdkError(
-          status_message="map_search_tool: Error with Google Maps API key.",
-          status_code=code_pb2.FAILED_PRECONDITION,
-          internal_details=f"map_search_tool: error details: {e}",
-      ) from e
-    except Exception as e:
-      logging.exception("An unexpected error occurred: %s", e)
-      raise opal_adk_error.OpalAdkError(
-          status_message="maps_search_tool: Internal error.",
-          status_code=code_pb2.INTERNAL,
-          internal_details=f"map_search_tool: Intenal error details: {e}",
-      ) from e
+    api_key = _get_maps_api_key()
+    return {"result": _search_and_format(api_key, query)}
+
+  async def run_async(
+      self, *, args: dict[str, Any], tool_context: tc.ToolContext
+  ) -> dict[str, Any]:
+    """Performs the search without blocking the agent's event loop.
+
+    The googlemaps client is blocking, so the search runs in a worker thread
+    and other tools can make progress meanwhile.
+
+    Args:
+      args: The tool arguments; "query" is the text string to search for.
+      tool_context: The tool context.
+
+    Returns:
+      A dictionary containing the formatted search results.
+    """
+    api_key = _get_maps_api_key()
+    result = await asyncio.to_thread(_search_and_format, api_key, args["query"])
+    return {"result": result}
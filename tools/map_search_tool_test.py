@@ -1,6 +1,8 @@
 """Unit tests for map_search_tool."""
 
 import logging
+import threading
+import unittest
 from unittest import mock
 
 from absl import flags as absl_flags
@@ -36,6 +38,10 @@ class MapSearchToolTest(absltest.TestCase):
     self.mock_logging = self.enter_context(
         mock.patch.object(logging, "error", autospec=True)
     )
+    map_search_tool._get_gmaps_client.cache_clear()
+    self.addCleanup(map_search_tool._get_gmaps_client.cache_clear)
+    map_search_tool._PLACES_CACHE.clear()
+    self.addCleanup(map_search_tool._PLACES_CACHE.clear)
     self.tool = map_search_tool.MapSearchTool()
 
   def test_format_results_string_input(self):
@@ -127,22 +133,141 @@ class MapSearchToolTest(absltest.TestCase):
     )
 
   def test_call_api_error(self):
-    self.mock_client_instance.places.side_effect = exceptions.ApiError("error")
-    with self.assertRaisesRegex(
-        opal_adk_error.OpalAdkError,
-        "map_search_tool: Error with Google Maps API key.",
-    ):
+    self.mock_client_instance.places.side_effect = exceptions.ApiError(
+        "secret error"
+    )
+    with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
       self.tool(query="test", context=mock.MagicMock())
+    self.assertEqual(
+        cm.exception.status_message,
+        "map_search_tool: Error with Google Maps API key.",
+    )
+    self.assertIn("secret error", str(cm.exception))
+    self.assertNotIn("secret error", cm.exception.external_message())
     self.mock_logging.assert_called_once()
 
   def test_call_exception(self):
-    self.mock_client_instance.places.side_effect = Exception("error")
-    with self.assertRaisesRegex(
-        opal_adk_error.OpalAdkError, "maps_search_tool: Internal error."
-    ):
+    self.mock_client_instance.places.side_effect = Exception("secret error")
+    with self.assertRaises(opal_adk_error.OpalAdkError) as cm:
       self.tool(query="test", context=mock.MagicMock())
+    self.assertEqual(
+        cm.exception.status_message, "map_search_tool: Internal error."
+    )
+    self.assertIn("secret error", str(cm.exception))
+    self.assertNotIn("secret error", cm.exception.external_message())
     self.mock_logging.assert_called_once()
 
+  def test_call_reuses_results_for_repeated_query(self):
+    self.mock_client_instance.places.return_value = "results"
+
+    self.tool(query="test query", context=mock.MagicMock())
+    res = self.tool(query=" Test Query", context=mock.MagicMock())
+
+    self.mock_client_instance.places.assert_called_once_with(query="test query")
+    self.assertEqual(
+        res["result"],
+        "Search Query:  Test Query\n\n## Google Places Search Results\n\n"
+        "results",
+    )
+
+  def test_call_reuses_client_across_queries(self):
+    self.mock_client_instance.places.return_value = "results"
+
+    self.tool(query="first query", context=mock.MagicMock())
+    self.tool(query="second query", context=mock.MagicMock())
+
+    self.mock_client.assert_called_once_with(key="fake_api_key")
+    self.assertEqual(self.mock_client_instance.places.call_count, 2)
+
+  def test_call_does_not_cache_errors(self):
+    self.mock_client_instance.places.side_effect = [
+        Exception("error"),
+        "results",
+    ]
+
+    with self.assertRaises(opal_adk_error.OpalAdkError):
+      self.tool(query="test query", context=mock.MagicMock())
+    res = self.tool(query="test query", context=mock.MagicMock())
+
+    self.assertEqual(self.mock_client_instance.places.call_count, 2)
+    self.assertEndsWith(res["result"], "results")
+
+
+class SearchPlacesBatchTest(
+    absltest.TestCase, unittest.IsolatedAsyncioTestCase
+):
+
+  def setUp(self):
+    super().setUp()
+    self.mock_client_instance = mock.MagicMock()
+    self.mock_client = self.enter_context(
+        mock.patch(
+            "googlemaps.Client",
+            return_value=self.mock_client_instance,
+            autospec=True,
+        )
+    )
+    self.mock_flags = self.enter_context(
+        mock.patch.object(
+            flags,
+            "get_maps_api_key",
+            return_value="fake_api_key",
+            autospec=True,
+        )
+    )
+    map_search_tool._get_gmaps_client.cache_clear()
+    self.addCleanup(map_search_tool._get_gmaps_client.cache_clear)
+    map_search_tool._PLACES_CACHE.clear()
+    self.addCleanup(map_search_tool._PLACES_CACHE.clear)
+
+  async def test_search_places_batch_returns_results_in_order(self):
+    self.mock_client_instance.places.side_effect = (
+        lambda query: f"results for {query}"
+    )
+
+    results = await map_search_tool.search_places_batch(["first", "second"])
+
+    self.assertEqual(
+        results,
+        [
+            "Search Query: first\n\n## Google Places Search Results\n\n"
+            "results for first",
+            "Search Query: second\n\n## Google Places Search Results\n\n"
+            "results for second",
+        ],
+    )
+    self.assertEqual(self.mock_client_instance.places.call_count, 2)
+
+  async def test_run_async_searches_in_worker_thread(self):
+    self.mock_client_instance.places.side_effect = lambda query: (
+        "main thread"
+        if threading.current_thread() is threading.main_thread()
+        else "worker thread"
+    )
+
+    res = await map_search_tool.MapSearchTool().run_async(
+        args={"query": "test query"}, tool_context=mock.MagicMock()
+    )
+
+    self.assertEqual(
+        res,
+        {
+            "result": (
+                "Search Query: test query\n\n## Google Places Search"
+                " Results\n\nworker thread"
+            )
+        },
+    )
+
+  async def test_search_places_batch_no_api_key(self):
+    self.mock_flags.return_value = None
+
+    with self.assertRaisesRegex(
+        opal_adk_error.OpalAdkError, "Google Maps Platform API key is required."
+    ):
+      await map_search_tool.search_places_batch(["test"])
+    self.mock_client.assert_not_called()
+
 
 if __name__ == "__main__":
   FLAGS.set_default("opal_adk_gcp_service_account", "dummy_sa")
@@ -1,16 +1,19 @@
 """Contains agent instructions for the system functions."""
 
 import datetime
+import functools
+import time
 
 FAILED_TO_FULFILL_FUNCTION = "objective_failed"
 OBJECTIVE_FULFILLED_FUNCTION = "objective_fulfilled"
 
-SYSTEM_FUNCTIONS_INSTRUCTIONS = f"""
+# Only the current time varies between uses, so it is filled in on demand.
+_SYSTEM_FUNCTIONS_INSTRUCTIONS_TEMPLATE = f"""
 You are an LLM-powered AI agent. You are embedded into an application. During this session, your job is to fulfill the objective, specified at the start of the conversation context. The objective provided by the application and is not visible to the user of the application.
 
 You are linked with other AI agents via hyperlinks. The <a href="url">title</a> syntax points at another agent. If the objective calls for it, you can transfer control to this agent. To transfer control, use the url of the agent in the  "href" parameter when calling "${OBJECTIVE_FULFILLED_FUNCTION}" or "${FAILED_TO_FULFILL_FUNCTION}" function. As a result, the outcome will be transferred to that agent.
 
-To help you orient in time, today is {datetime.datetime.now().strftime("%B %d, %Y, %I:%M %p")}
+To help you orient in time, today is {{today}}
 
 In your pursuit of fulfilling the objective, follow this meta-plan PRECISELY.
 
@@ -61,4 +64,22 @@ In rare cases when you failed to fulfill the objective, invoke the "{FAILED_TO_F
 While fulfilling the task, it may become apparent to you that your initial guess of the problem domain is wrong. Most commonly, this will cause the problem domain escalation: simple problems turn out complicated, and complicated become complex. Be deliberate about recognizing this change. When it happens, remind yourself about the problem domain escalation and adjust the strategy appropriately.
 
 </meta-plan>
-"""
\ No newline at end of file
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _system_functions_instructions(minute: int) -> str:
+  """Returns the instructions stamped with the given minute since the epoch."""
+  today = datetime.datetime.fromtimestamp(minute * 60).strftime(
+      "%B %d, %Y, %I:%M %p"
+  )
+  return _SYSTEM_FUNCTIONS_INSTRUCTIONS_TEMPLATE.format(today=today)
+
+
+def get_system_functions_instructions() -> str:
+  """Returns the system function instructions with the current time.
+
+  The time is shown to the minute, so the instructions are formatted at most
+  once per minute.
+  """
+  return _system_functions_instructions(int(time.time() // 60))
@@ -0,0 +1,39 @@
+"""Tests for instructions."""
+
+import unittest
+from unittest import mock
+
+from opal_adk.tools.system import instructions
+
+
+class SystemFunctionsInstructionsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    instructions._system_functions_instructions.cache_clear()
+    self.addCleanup(instructions._system_functions_instructions.cache_clear)
+
+  def test_includes_function_names(self):
+    result = instructions.get_system_functions_instructions()
+
+    self.assertIn(f"${instructions.OBJECTIVE_FULFILLED_FUNCTION}", result)
+    self.assertIn(f'"{instructions.FAILED_TO_FULFILL_FUNCTION}"', result)
+    self.assertNotIn("{today}", result)
+
+  def test_formats_once_per_minute(self):
+    with mock.patch.object(
+        instructions.time, "time", autospec=True, return_value=600.0
+    ) as mock_time:
+      first = instructions.get_system_functions_instructions()
+      mock_time.return_value = 659.0
+      second = instructions.get_system_functions_instructions()
+      mock_time.return_value = 660.0
+      instructions.get_system_functions_instructions()
+
+    self.assertIs(first, second)
+    cache_info = instructions._system_functions_instructions.cache_info()
+    self.assertEqual(cache_info.misses, 2)
+
+
+if __name__ == "__main__":
+  unittest.main()
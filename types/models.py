@@ -36,6 +36,18 @@ class Models(enum.Enum):
   VEO_3_1_FAST = "veo-3.1-fast-generate-preview"
 
 
+# Dispatch tables keyed by enum member, so a conversion is a single hash
+# lookup rather than a chain of equality checks.
+_SIMPLE_MODEL_TO_MODEL = {
+    SimpleModel.PRO: Models.PRO_MODEL_NAME,
+    SimpleModel.LITE: Models.LITE_MODEL_NAME,
+    SimpleModel.FLASH: Models.FLASH_MODEL_NAME,
+}
+_SIMPLE_MODEL_TO_IMAGE_MODEL = {
+    SimpleModel.PRO: Models.GEMINI_3_PRO_IMAGE,
+}
+
+
 def simple_model_to_model(simple_model: SimpleModel) -> Models:
   """Converts a SimpleModel enum to its corresponding Models enum.
 
@@ -45,13 +57,7 @@ def simple_model_to_model(simple_model: SimpleModel) -> Models:
   Returns:
     The corresponding Models enum value.
   """
-  match simple_model:
-    case SimpleModel.PRO:
-      return Models.PRO_MODEL_NAME
-    case SimpleModel.LITE:
-      return Models.LITE_MODEL_NAME
-    case SimpleModel.FLASH:
-      return Models.FLASH_MODEL_NAME
+  return _SIMPLE_MODEL_TO_MODEL[simple_model]
 
 
 def simple_model_to_image_model(simple_model: SimpleModel) -> Models:
@@ -63,9 +69,6 @@ def simple_model_to_image_model(simple_model: SimpleModel) -> Models:
   Returns:
     The corresponding image generation Models enum value.
   """
-  match simple_model:
-    case SimpleModel.PRO:
-      return Models.GEMINI_3_PRO_IMAGE
-    case _:
-      return Models.GEMINI_2_5_FLASH_IMAGE
-
+  return _SIMPLE_MODEL_TO_IMAGE_MODEL.get(
+      simple_model, Models.GEMINI_2_5_FLASH_IMAGE
+  )
@@ -0,0 +1,60 @@
+"""Circuit breakers that skip models which keep failing for capacity reasons."""
+
+import functools
+import threading
+import time
+
+_FAIL_MAX = 5
+_RESET_TIMEOUT_SECONDS = 60.0
+
+
+class CircuitBreaker:
+  """Opens after consecutive failures and stays open for a cool-down window.
+
+  While open, callers should skip the model instead of probing it again. Once
+  the window has passed requests are allowed through; the next failure opens
+  the breaker again and the next success closes it.
+  """
+
+  def __init__(
+      self,
+      fail_max: int = _FAIL_MAX,
+      reset_timeout_seconds: float = _RESET_TIMEOUT_SECONDS,
+  ):
+    """Initializes a closed breaker.
+
+    Args:
+      fail_max: Consecutive failures that open the breaker.
+      reset_timeout_seconds: How long the breaker stays open.
+    """
+    self._fail_max = fail_max
+    self._reset_timeout_seconds = reset_timeout_seconds
+    self._failures = 0
+    self._opened_at: float | None = None
+    self._lock = threading.Lock()
+
+  def allow_request(self) -> bool:
+    """Returns False while the breaker is open."""
+    with self._lock:
+      if self._opened_at is None:
+        return True
+      return time.monotonic() - self._opened_at >= self._reset_timeout_seconds
+
+  def record_success(self) -> None:
+    """Closes the breaker and resets the failure count."""
+    with self._lock:
+      self._failures = 0
+      self._opened_at = None
+
+  def record_failure(self) -> None:
+    """Counts a failure, opening the breaker once fail_max is reached."""
+    with self._lock:
+      self._failures += 1
+      if self._failures >= self._fail_max:
+        self._opened_at = time.monotonic()
+
+
+@functools.lru_cache(maxsize=None)
+def get_circuit_breaker(model_name: str) -> CircuitBreaker:
+  """Returns the process-wide circuit breaker for a model."""
+  return CircuitBreaker()
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from absl.testing import absltest
+from opal_adk.util import circuit_breaker
+
+
+class CircuitBreakerTest(absltest.TestCase):
+  """Tests for CircuitBreaker."""
+
+  def setUp(self):
+    super().setUp()
+    self.mock_monotonic = self.enter_context(
+        mock.patch.object(
+            circuit_breaker.time, 'monotonic', autospec=True, return_value=100.0
+        )
+    )
+
+  def test_opens_after_fail_max_failures(self):
+    breaker = circuit_breaker.CircuitBreaker(fail_max=2)
+
+    breaker.record_failure()
+    self.assertTrue(breaker.allow_request())
+    breaker.record_failure()
+    self.assertFalse(breaker.allow_request())
+
+  def test_success_resets_failure_count(self):
+    breaker = circuit_breaker.CircuitBreaker(fail_max=2)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    self.assertTrue(breaker.allow_request())
+
+  def test_allows_requests_after_reset_timeout(self):
+    breaker = circuit_breaker.CircuitBreaker(
+        fail_max=1, reset_timeout_seconds=60
+    )
+    breaker.record_failure()
+
+    self.mock_monotonic.return_value = 159.0
+    self.assertFalse(breaker.allow_request())
+    self.mock_monotonic.return_value = 160.0
+    self.assertTrue(breaker.allow_request())
+
+  def test_failure_after_reset_timeout_reopens(self):
+    breaker = circuit_breaker.CircuitBreaker(
+        fail_max=1, reset_timeout_seconds=60
+    )
+    breaker.record_failure()
+    self.mock_monotonic.return_value = 160.0
+
+    breaker.record_failure()
+
+    self.assertFalse(breaker.allow_request())
+
+  def test_get_circuit_breaker_is_shared_per_model(self):
+    circuit_breaker.get_circuit_breaker.cache_clear()
+    self.addCleanup(circuit_breaker.get_circuit_breaker.cache_clear)
+
+    self.assertIs(
+        circuit_breaker.get_circuit_breaker('model-a'),
+        circuit_breaker.get_circuit_breaker('model-a'),
+    )
+    self.assertIsNot(
+        circuit_breaker.get_circuit_breaker('model-a'),
+        circuit_breaker.get_circuit_breaker('model-b'),
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
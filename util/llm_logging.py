@@ -345,11 +345,12 @@ def log_operation_start(operation_name: str) -> None:
 
   try:
     tracer = get_current_tracer()
-    time_str = datetime.datetime.now().strftime('%H:%M:%S')
-    _log_styled(
-        f'{EMOJI_START} [{time_str}] Starting: {operation_name}',
-        indent=tracer.current_depth,
-    )
+    if _is_info_enabled():
+      time_str = datetime.datetime.now().strftime('%H:%M:%S')
+      _log_styled(
+          f'{EMOJI_START} [{time_str}] Starting: {operation_name}',
+          indent=tracer.current_depth,
+      )
     _operation_start_times[operation_name] = time.time()
     tracer.current_depth += 1
   except Exception as e:  # pylint: disable=broad-except
@@ -370,6 +371,8 @@ def log_operation_end(operation_name: str, success: bool = True) -> None:
     tracer.current_depth = max(0, tracer.current_depth - 1)
 
     start_time = _operation_start_times.pop(operation_name, time.time())
+    if not _is_info_enabled():
+      return
     elapsed = time.time() - start_time
     time_str = datetime.datetime.now().strftime('%H:%M:%S')
 
@@ -389,6 +392,11 @@ def log_operation_end(operation_name: str, success: bool = True) -> None:
     logging.warning('log_operation_end failed: %s', e)
 
 
+def _is_info_enabled() -> bool:
+  """Returns whether INFO records are emitted, to skip building messages."""
+  return logging.getLogger().isEnabledFor(logging.INFO)
+
+
 def _log_styled(message: str, indent: int = 0) -> None:
   """Log a styled message with indentation."""
   indent_str = '  ' * indent
@@ -0,0 +1,49 @@
+"""Semaphores that can be shared by code running on different event loops."""
+
+import asyncio
+import threading
+from typing import Any
+
+
+class PerLoopSemaphore:
+  """Bounds concurrency with one asyncio.Semaphore per running event loop.
+
+  An asyncio.Semaphore binds to the first event loop that waits on it, and
+  waiting on it from another loop raises RuntimeError. Module-level limits are
+  reached from several loops (a new loop per asyncio.run call or per test), so
+  this creates each loop's semaphore lazily on first use. A process normally
+  runs one loop, in which case the limit is process-wide.
+  """
+
+  def __init__(self, value: int):
+    """Initializes the semaphore.
+
+    Args:
+      value: The number of holders allowed at once on each event loop.
+    """
+    self._value = value
+    self._semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+    self._lock = threading.Lock()
+
+  def _get_semaphore(self) -> asyncio.Semaphore:
+    """Returns the semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with self._lock:
+      semaphore = self._semaphores.get(loop)
+      if semaphore is None:
+        # A semaphore keeps its loop alive once bound, so entries for closed
+        # loops are dropped here rather than left to weak references.
+        self._semaphores = {
+            other_loop: other_semaphore
+            for other_loop, other_semaphore in self._semaphores.items()
+            if not other_loop.is_closed()
+        }
+        semaphore = asyncio.Semaphore(self._value)
+        self._semaphores[loop] = semaphore
+      return semaphore
+
+  async def __aenter__(self) -> None:
+    await self._get_semaphore().acquire()
+
+  async def __aexit__(self, *unused_exc_info: Any) -> None:
+    self._get_semaphore().release()
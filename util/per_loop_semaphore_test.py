@@ -0,0 +1,49 @@
+import asyncio
+
+from absl.testing import absltest
+from opal_adk.util import per_loop_semaphore
+
+
+class PerLoopSemaphoreTest(absltest.TestCase):
+  """Tests for PerLoopSemaphore."""
+
+  def test_bounds_concurrent_holders(self):
+    semaphore = per_loop_semaphore.PerLoopSemaphore(2)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _hold():
+      nonlocal in_flight, max_in_flight
+      async with semaphore:
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    async def _run():
+      await asyncio.gather(*(_hold() for _ in range(5)))
+
+    asyncio.run(_run())
+
+    self.assertEqual(max_in_flight, 2)
+
+  def test_usable_from_successive_event_loops(self):
+    semaphore = per_loop_semaphore.PerLoopSemaphore(1)
+
+    async def _contend():
+      async def _hold():
+        async with semaphore:
+          await asyncio.sleep(0)
+
+      await asyncio.gather(_hold(), _hold())
+
+    # Contention makes a plain asyncio.Semaphore bind to the first loop, so
+    # the second run would raise RuntimeError.
+    asyncio.run(_contend())
+    asyncio.run(_contend())
+
+    self.assertLen(semaphore._semaphores, 1)
+
+
+if __name__ == '__main__':
+  absltest.main()
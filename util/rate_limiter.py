@@ -0,0 +1,93 @@
+"""Adaptive client-side rate limiting for quota-bound model calls."""
+
+import asyncio
+import functools
+import threading
+import time
+
+_INITIAL_RATE_PER_SECOND = 2.0
+_MIN_RATE_PER_SECOND = 0.1
+_MAX_RATE_PER_SECOND = 10.0
+_BURST_CAPACITY = 4.0
+_RATE_INCREASE_PER_SECOND = 0.1
+_RATE_DECREASE_FACTOR = 0.5
+
+
+class RateLimiter:
+  """Token bucket whose refill rate adapts to throttling (AIMD).
+
+  Each success raises the rate additively, and each throttled call halves it,
+  so callers sharing a quota converge on the rate it can sustain instead of
+  retrying into repeated 429s.
+  """
+
+  def __init__(
+      self,
+      initial_rate: float = _INITIAL_RATE_PER_SECOND,
+      min_rate: float = _MIN_RATE_PER_SECOND,
+      max_rate: float = _MAX_RATE_PER_SECOND,
+      burst_capacity: float = _BURST_CAPACITY,
+  ):
+    """Initializes the limiter with a full bucket.
+
+    Args:
+      initial_rate: Requests per second allowed before any feedback.
+      min_rate: The floor the rate never drops below.
+      max_rate: The ceiling the rate never rises above.
+      burst_capacity: The most requests that may start back to back.
+    """
+    self._rate = initial_rate
+    self._min_rate = min_rate
+    self._max_rate = max_rate
+    self._capacity = burst_capacity
+    self._tokens = burst_capacity
+    self._updated = time.monotonic()
+    self._lock = threading.Lock()
+
+  @property
+  def rate(self) -> float:
+    """The current refill rate in requests per second."""
+    return self._rate
+
+  def _reserve(self) -> float:
+    """Takes a token and returns how many seconds to wait before using it."""
+    with self._lock:
+      now = time.monotonic()
+      self._tokens = min(
+          self._capacity, self._tokens + (now - self._updated) * self._rate
+      )
+      self._updated = now
+      # The balance may go negative, which queues later callers behind this
+      # one.
+      self._tokens -= 1
+      if self._tokens >= 0:
+        return 0.0
+      return -self._tokens / self._rate
+
+  def acquire(self) -> None:
+    """Blocks until the caller may send a request."""
+    delay = self._reserve()
+    if delay:
+      time.sleep(delay)
+
+  async def acquire_async(self) -> None:
+    """Waits, without blocking the event loop, until a request may be sent."""
+    delay = self._reserve()
+    if delay:
+      await asyncio.sleep(delay)
+
+  def record_success(self) -> None:
+    """Additively raises the rate after a request was accepted."""
+    with self._lock:
+      self._rate = min(self._max_rate, self._rate + _RATE_INCREASE_PER_SECOND)
+
+  def record_throttled(self) -> None:
+    """Multiplicatively lowers the rate after a request was rate limited."""
+    with self._lock:
+      self._rate = max(self._min_rate, self._rate * _RATE_DECREASE_FACTOR)
+
+
+@functools.lru_cache(maxsize=None)
+def get_rate_limiter(model_name: str) -> RateLimiter:
+  """Returns the process-wide rate limiter for a model's quota."""
+  return RateLimiter()
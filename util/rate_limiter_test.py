@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+
+from absl.testing import absltest
+from opal_adk.util import rate_limiter
+
+
+class RateLimiterTest(absltest.TestCase):
+  """Tests for RateLimiter."""
+
+  def setUp(self):
+    super().setUp()
+    self.mock_monotonic = self.enter_context(
+        mock.patch.object(
+            rate_limiter.time, 'monotonic', autospec=True, return_value=100.0
+        )
+    )
+    self.mock_sleep = self.enter_context(
+        mock.patch.object(rate_limiter.time, 'sleep', autospec=True)
+    )
+
+  def test_burst_is_not_delayed(self):
+    limiter = rate_limiter.RateLimiter(initial_rate=1.0, burst_capacity=2.0)
+
+    limiter.acquire()
+    limiter.acquire()
+
+    self.mock_sleep.assert_not_called()
+
+  def test_requests_beyond_burst_are_paced(self):
+    limiter = rate_limiter.RateLimiter(initial_rate=2.0, burst_capacity=1.0)
+
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+
+    self.assertEqual(
+        self.mock_sleep.call_args_list, [mock.call(0.5), mock.call(1.0)]
+    )
+
+  def test_tokens_refill_over_time(self):
+    limiter = rate_limiter.RateLimiter(initial_rate=2.0, burst_capacity=1.0)
+    limiter.acquire()
+
+    self.mock_monotonic.return_value = 100.5
+    limiter.acquire()
+
+    self.mock_sleep.assert_not_called()
+
+  def test_throttling_halves_rate_down_to_min(self):
+    limiter = rate_limiter.RateLimiter(initial_rate=1.0, min_rate=0.3)
+
+    limiter.record_throttled()
+    self.assertEqual(limiter.rate, 0.5)
+    limiter.record_throttled()
+    self.assertEqual(limiter.rate, 0.3)
+
+  def test_success_raises_rate_up_to_max(self):
+    limiter = rate_limiter.RateLimiter(initial_rate=1.0, max_rate=1.15)
+
+    limiter.record_success()
+    self.assertAlmostEqual(limiter.rate, 1.1)
+    limiter.record_success()
+    self.assertEqual(limiter.rate, 1.15)
+
+  def test_get_rate_limiter_is_shared_per_model(self):
+    rate_limiter.get_rate_limiter.cache_clear()
+    self.addCleanup(rate_limiter.get_rate_limiter.cache_clear)
+
+    self.assertIs(
+        rate_limiter.get_rate_limiter('model-a'),
+        rate_limiter.get_rate_limiter('model-a'),
+    )
+    self.assertIsNot(
+        rate_limiter.get_rate_limiter('model-a'),
+        rate_limiter.get_rate_limiter('model-b'),
+    )
+
+
+class RateLimiterAsyncTest(
+    absltest.TestCase, unittest.IsolatedAsyncioTestCase
+):
+  """Tests for RateLimiter.acquire_async."""
+
+  async def test_acquire_async_waits_without_blocking(self):
+    with mock.patch.object(
+        rate_limiter.asyncio, 'sleep', autospec=True
+    ) as mock_sleep, mock.patch.object(
+        rate_limiter.time, 'monotonic', autospec=True, return_value=100.0
+    ):
+      limiter = rate_limiter.RateLimiter(initial_rate=4.0, burst_capacity=1.0)
+      await limiter.acquire_async()
+      await limiter.acquire_async()
+
+    mock_sleep.assert_awaited_once_with(0.25)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,90 @@
+"""Response caches for idempotent, expensive model calls."""
+
+import collections
+import hashlib
+import threading
+import time
+from typing import Generic, Protocol, TypeVar
+
+_V = TypeVar('_V')
+
+_DEFAULT_MAX_ENTRIES = 128
+_DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+def make_cache_key(*parts: str | None) -> str:
+  """Returns a stable cache key fingerprinting the given request fields.
+
+  Args:
+    *parts: The request fields that determine the response. None is kept
+      distinct from the empty string.
+
+  Returns:
+    The hex SHA-256 digest of the fields.
+  """
+  digest = hashlib.sha256()
+  for part in parts:
+    # Length-prefix each field so ('ab', 'c') and ('a', 'bc') differ.
+    encoded = b'\xff' if part is None else part.encode('utf-8')
+    digest.update(len(encoded).to_bytes(8, 'big'))
+    digest.update(encoded)
+  return digest.hexdigest()
+
+
+class CacheBackend(Protocol[_V]):
+  """Storage for cached responses, keyed by make_cache_key()."""
+
+  def get(self, key: str) -> _V | None:
+    """Returns the cached value for key, or None on a miss."""
+    ...
+
+  def set(self, key: str, value: _V) -> None:
+    """Stores value under key."""
+    ...
+
+
+class InMemoryLRUCache(Generic[_V]):
+  """Thread-safe, size-capped LRU cache whose entries expire after a TTL."""
+
+  def __init__(
+      self,
+      max_entries: int = _DEFAULT_MAX_ENTRIES,
+      ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+  ):
+    """Initializes the cache.
+
+    Args:
+      max_entries: The most entries kept; the least recently used entry is
+        evicted beyond this.
+      ttl_seconds: How long an entry is served after it was stored.
+    """
+    self._max_entries = max_entries
+    self._ttl_seconds = ttl_seconds
+    self._entries: collections.OrderedDict[str, tuple[float, _V]] = (
+        collections.OrderedDict()
+    )
+    self._lock = threading.Lock()
+
+  def get(self, key: str) -> _V | None:
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+      expires_at, value = entry
+      if expires_at <= time.monotonic():
+        del self._entries[key]
+        return None
+      self._entries.move_to_end(key)
+      return value
+
+  def set(self, key: str, value: _V) -> None:
+    with self._lock:
+      self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self._max_entries:
+        self._entries.popitem(last=False)
+
+  def clear(self) -> None:
+    """Drops every entry."""
+    with self._lock:
+      self._entries.clear()
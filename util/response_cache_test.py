@@ -0,0 +1,63 @@
+from unittest import mock
+
+from absl.testing import absltest
+from opal_adk.util import response_cache
+
+
+class MakeCacheKeyTest(absltest.TestCase):
+  """Tests for make_cache_key."""
+
+  def test_same_fields_give_same_key(self):
+    self.assertEqual(
+        response_cache.make_cache_key('prompt', '1:1', None),
+        response_cache.make_cache_key('prompt', '1:1', None),
+    )
+
+  def test_field_boundaries_are_part_of_key(self):
+    self.assertNotEqual(
+        response_cache.make_cache_key('ab', 'c'),
+        response_cache.make_cache_key('a', 'bc'),
+    )
+
+  def test_none_differs_from_empty_string(self):
+    self.assertNotEqual(
+        response_cache.make_cache_key('prompt', None),
+        response_cache.make_cache_key('prompt', ''),
+    )
+
+
+class InMemoryLRUCacheTest(absltest.TestCase):
+  """Tests for InMemoryLRUCache."""
+
+  def test_get_returns_stored_value(self):
+    cache = response_cache.InMemoryLRUCache()
+    cache.set('key', (b'bytes', 'image/png'))
+
+    self.assertEqual(cache.get('key'), (b'bytes', 'image/png'))
+    self.assertIsNone(cache.get('missing'))
+
+  def test_evicts_least_recently_used(self):
+    cache = response_cache.InMemoryLRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    self.assertEqual(cache.get('a'), 1)
+    self.assertIsNone(cache.get('b'))
+    self.assertEqual(cache.get('c'), 3)
+
+  @mock.patch.object(response_cache.time, 'monotonic', autospec=True)
+  def test_entries_expire_after_ttl(self, mock_monotonic):
+    cache = response_cache.InMemoryLRUCache(ttl_seconds=10)
+    mock_monotonic.return_value = 100.0
+    cache.set('key', 1)
+
+    mock_monotonic.return_value = 109.0
+    self.assertEqual(cache.get('key'), 1)
+    mock_monotonic.return_value = 110.0
+    self.assertIsNone(cache.get('key'))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,98 @@
+"""Retries model calls with exponential backoff and jitter on transient errors."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import random
+import time
+from typing import Any, TypeVar
+
+from opal_adk.error_handling import retriable
+
+_T = TypeVar('_T')
+
+_MAX_ATTEMPTS = 5
+_BASE_DELAY_SECONDS = 0.5
+_MAX_DELAY_SECONDS = 8.0
+
+
+def _backoff_delay_seconds(attempt: int) -> float:
+  """Returns the delay before retrying after the given zero-based attempt.
+
+  The delay doubles with every attempt up to a cap, and is scaled by a random
+  factor in [0.5, 1.5) so that concurrent callers don't retry in lockstep.
+
+  Args:
+    attempt: The zero-based index of the attempt that just failed.
+
+  Returns:
+    The number of seconds to wait before the next attempt.
+  """
+  delay = min(_MAX_DELAY_SECONDS, _BASE_DELAY_SECONDS * 2**attempt)
+  return delay * (0.5 + random.random())
+
+
+def call_with_backoff(fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+  """Calls fn, retrying with exponential backoff on retriable errors.
+
+  Args:
+    fn: The function to call.
+    *args: Positional arguments passed to fn.
+    **kwargs: Keyword arguments passed to fn.
+
+  Returns:
+    The return value of fn.
+
+  Raises:
+    Exception: The last error raised by fn if it is not retriable or all
+      attempts are exhausted.
+  """
+  for attempt in range(_MAX_ATTEMPTS - 1):
+    try:
+      return fn(*args, **kwargs)
+    except Exception as e:  # pylint: disable=broad-except
+      if not retriable.is_retriable(e):
+        raise
+      delay = _backoff_delay_seconds(attempt)
+      logging.warning(
+          'retry_util: retriable error on attempt %d, retrying in %.2fs: %s',
+          attempt + 1,
+          delay,
+          e,
+      )
+      time.sleep(delay)
+  return fn(*args, **kwargs)
+
+
+async def call_with_backoff_async(
+    fn: Callable[..., Awaitable[_T]], *args: Any, **kwargs: Any
+) -> _T:
+  """Awaits fn, retrying with exponential backoff on retriable errors.
+
+  Args:
+    fn: The coroutine function to call.
+    *args: Positional arguments passed to fn.
+    **kwargs: Keyword arguments passed to fn.
+
+  Returns:
+    The result of awaiting fn.
+
+  Raises:
+    Exception: The last error raised by fn if it is not retriable or all
+      attempts are exhausted.
+  """
+  for attempt in range(_MAX_ATTEMPTS - 1):
+    try:
+      return await fn(*args, **kwargs)
+    except Exception as e:  # pylint: disable=broad-except
+      if not retriable.is_retriable(e):
+        raise
+      delay = _backoff_delay_seconds(attempt)
+      logging.warning(
+          'retry_util: retriable error on attempt %d, retrying in %.2fs: %s',
+          attempt + 1,
+          delay,
+          e,
+      )
+      await asyncio.sleep(delay)
+  return await fn(*args, **kwargs)
@@ -0,0 +1,100 @@
+import unittest
+from unittest import mock
+
+from absl.testing import absltest
+from google.genai import errors as genai_errors
+from opal_adk.util import retry_util
+
+
+def _client_error(code: int) -> genai_errors.ClientError:
+  return genai_errors.ClientError(code, {'error': {'message': 'error'}})
+
+
+class CallWithBackoffTest(absltest.TestCase):
+  """Tests for call_with_backoff."""
+
+  def setUp(self):
+    super().setUp()
+    self.mock_sleep = self.enter_context(
+        mock.patch.object(retry_util.time, 'sleep', autospec=True)
+    )
+
+  def test_returns_result_without_retry(self):
+    fn = mock.Mock(return_value='result')
+    self.assertEqual(
+        retry_util.call_with_backoff(fn, 'arg', key='value'), 'result'
+    )
+    fn.assert_called_once_with('arg', key='value')
+    self.mock_sleep.assert_not_called()
+
+  def test_retries_rate_limited_call(self):
+    fn = mock.Mock(side_effect=[_client_error(429), _client_error(429), 'ok'])
+    self.assertEqual(retry_util.call_with_backoff(fn), 'ok')
+    self.assertEqual(fn.call_count, 3)
+    self.assertEqual(self.mock_sleep.call_count, 2)
+
+  def test_retries_server_error(self):
+    # Errors that trigger a model fallback are retried here too.
+    fn = mock.Mock(
+        side_effect=[
+            genai_errors.ServerError(500, {'error': {'message': 'error'}}),
+            'ok',
+        ]
+    )
+    self.assertEqual(retry_util.call_with_backoff(fn), 'ok')
+    self.assertEqual(fn.call_count, 2)
+
+  def test_does_not_retry_non_retriable_error(self):
+    fn = mock.Mock(side_effect=_client_error(400))
+    with self.assertRaises(genai_errors.ClientError):
+      retry_util.call_with_backoff(fn)
+    fn.assert_called_once()
+    self.mock_sleep.assert_not_called()
+
+  def test_raises_after_max_attempts(self):
+    fn = mock.Mock(side_effect=_client_error(429))
+    with self.assertRaises(genai_errors.ClientError):
+      retry_util.call_with_backoff(fn)
+    self.assertEqual(fn.call_count, retry_util._MAX_ATTEMPTS)
+    self.assertEqual(self.mock_sleep.call_count, retry_util._MAX_ATTEMPTS - 1)
+
+  def test_backoff_delay_grows_and_is_capped(self):
+    with mock.patch.object(retry_util.random, 'random', return_value=0.5):
+      delays = [
+          retry_util._backoff_delay_seconds(attempt) for attempt in range(10)
+      ]
+    self.assertEqual(delays[0], retry_util._BASE_DELAY_SECONDS)
+    self.assertEqual(delays[1], retry_util._BASE_DELAY_SECONDS * 2)
+    self.assertEqual(delays[-1], retry_util._MAX_DELAY_SECONDS)
+
+
+class CallWithBackoffAsyncTest(
+    absltest.TestCase, unittest.IsolatedAsyncioTestCase
+):
+  """Tests for call_with_backoff_async."""
+
+  def setUp(self):
+    super().setUp()
+    self.mock_sleep = self.enter_context(
+        mock.patch.object(retry_util.asyncio, 'sleep', new=mock.AsyncMock())
+    )
+
+  async def test_retries_rate_limited_call(self):
+    fn = mock.AsyncMock(side_effect=[_client_error(429), 'ok'])
+    self.assertEqual(
+        await retry_util.call_with_backoff_async(fn, key='value'), 'ok'
+    )
+    self.assertEqual(fn.await_count, 2)
+    fn.assert_awaited_with(key='value')
+    self.mock_sleep.assert_awaited_once()
+
+  async def test_does_not_retry_non_retriable_error(self):
+    fn = mock.AsyncMock(side_effect=ValueError('bad'))
+    with self.assertRaises(ValueError):
+      await retry_util.call_with_backoff_async(fn)
+    fn.assert_awaited_once()
+    self.mock_sleep.assert_not_awaited()
+
+
+if __name__ == '__main__':
+  absltest.main()